@@ -1,23 +1,80 @@
-import os
+from contextlib import asynccontextmanager
+from typing import Optional
 
 from src.app.api.main_router import main_router
-from src.app.core import config
+from src.app.core.config import Settings, get_settings, use_settings
+from src.app.core.consistency import ReadYourWritesMiddleware
+from src.app.core.hashing import shutdown_hashing_executor
+from src.app.core.idempotency import IdempotencyMiddleware, build_idempotency_store
+from src.app.core.instrumentation import MetricsMiddleware
+from src.app.core.jwt_handler import get_dummy_password_hash, token_cache
 import uvicorn
 from fastapi import FastAPI
 
-from src.app.core.dependencies import get_db
-from src.app.db.database import engine, Base
+from src.app.db.database import Base, SessionLocal, dispose_engine, init_engine
+from src.app.services.client import ClientService
+from src.app.services.client_cache import init_client_cache
+from src.app.services.client_changes import client_changes, listen_for_client_changes, \
+    stop_listening_for_client_changes
+from src.app.services.client_import import shutdown_import_jobs
 from src.app.services.superadmin import create_super_admin
 
-if config.ENVIRONMENT_TYPE == 'development':
-    Base.metadata.drop_all(bind=engine)
-    Base.metadata.create_all(bind=engine)
 
-    with next(get_db()) as db:
-        create_super_admin(db)
-app = FastAPI()
-app.include_router(main_router)
+async def bootstrap_database(settings: Settings):
+    async with init_engine(settings).begin() as connection:
+        if settings.schema_bootstrap == "reset":
+            await connection.run_sync(Base.metadata.drop_all)
+        await connection.run_sync(Base.metadata.create_all)
+
+    async with SessionLocal() as db:
+        await create_super_admin(db, settings)
+        if settings.schema_bootstrap == "create":
+            await ClientService.reconcile_status_counts(db)
+
+
+def create_app(settings: Optional[Settings] = None) -> FastAPI:
+    settings = settings or get_settings()
+
+    @asynccontextmanager
+    async def lifespan(app: FastAPI):
+        use_settings(settings)
+        token_cache.resize(settings.token_cache_size)
+        init_client_cache(settings)
+        client_changes.resize(settings.client_changes_buffer_size)
+        engine = init_engine(settings)
+        if settings.schema_bootstrap != "none":
+            await bootstrap_database(settings)
+        # Unknown-user logins verify against this hash; computing it up front keeps their cost equal to the rest.
+        await get_dummy_password_hash()
+        listener = None
+        if settings.client_changes_notify and engine.dialect.name == "postgresql":
+            listener = listen_for_client_changes(settings)
+        try:
+            yield
+        finally:
+            if listener is not None:
+                await stop_listening_for_client_changes(listener)
+            await shutdown_import_jobs()
+            await dispose_engine()
+            shutdown_hashing_executor()
+            use_settings(None)
+
+    app = FastAPI(lifespan=lifespan)
+    app.state.settings = settings
+    idempotency_store = build_idempotency_store(settings)
+    if idempotency_store is not None:
+        app.add_middleware(IdempotencyMiddleware, store=idempotency_store,
+                           wait_timeout=settings.idempotency_wait_timeout)
+    if settings.database_replica_urls:
+        app.add_middleware(ReadYourWritesMiddleware, max_age=settings.read_your_writes_seconds)
+    app.add_middleware(MetricsMiddleware)
+    app.include_router(main_router)
+    return app
+
+
+app = create_app()
 
 
 if __name__ == "__main__":
-    uvicorn.run(app, host=os.getenv("APP_HOST"), port=int(os.getenv("APP_PORT")))
+    settings = get_settings()
+    uvicorn.run(app, host=settings.app_host, port=settings.app_port)
@@ -2,6 +2,9 @@ from fastapi import APIRouter
 
 from src.app.api.routers.admin_router import router as admin_router
 from src.app.api.routers.client_router import router as client_router
+from src.app.api.routers.health_router import router as health_router
+from src.app.api.routers.internal_router import router as internal_router
+from src.app.api.routers.metrics_router import router as metrics_router
 
 from src.app.core.security import router as security_router
 
@@ -10,4 +13,7 @@ main_router = APIRouter()
 main_router.include_router(admin_router, prefix="/admins", tags=["Admins"])
 main_router.include_router(client_router, prefix="/clients", tags=["Clients"])
 main_router.include_router(security_router, prefix="/security", tags=["Security"])
+main_router.include_router(internal_router, prefix="/internal", tags=["Internal"])
+main_router.include_router(health_router, prefix="/health", tags=["Health"])
+main_router.include_router(metrics_router)
 
@@ -1,14 +1,17 @@
-from typing import List
+from typing import List, Optional
 
-from fastapi import Depends, APIRouter
+from fastapi import Depends, APIRouter, Query
 from pydantic import BaseModel
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 from starlette import status
 
-from src.app.core.dependencies import get_db
+from src.app.core.dependencies import get_db, get_read_db
 from src.app.core.jwt_handler import is_super_admin
+from src.app.core.pagination import build_page, decode_cursor, page_limit
+from src.app.core.projection import parse_fields, project_rows
+from src.app.core.serialization import FastJSONResponse
 
-from src.app.services.admin import AdminService
+from src.app.services.admin import ADMIN_FIELDS, AdminService
 
 router = APIRouter()
 
@@ -20,28 +23,39 @@ class AdminResponse(BaseModel):
     class Config:
         from_attributes = True
 
+class AdminPage(BaseModel):
+    items: List[AdminResponse]
+    next_cursor: Optional[str] = None
+
 class AdminRequest(BaseModel):
     username: str
     email: str
 
 
-@router.get("/list-admins", response_model=List[AdminResponse])
-def list_admins(db: Session = Depends(get_db),
-                 current_user: dict = Depends(is_super_admin)):
-    return AdminService.get_all_admins(db)
+@router.get("/list-admins", response_model=AdminPage)
+async def list_admins(limit: int = Depends(page_limit),
+                      cursor: Optional[str] = None,
+                      fields: Optional[str] = Query(None, description="Comma-separated fields to return."),
+                      db: AsyncSession = Depends(get_read_db),
+                      current_user: dict = Depends(is_super_admin)):
+    selected = parse_fields(fields, ADMIN_FIELDS)
+    admins = await AdminService.get_all_admins(db, limit + 1, decode_cursor(cursor), selected)
+    page = build_page(admins, limit)
+    page["items"] = project_rows(page["items"], selected)
+    return FastJSONResponse(page)
 
 @router.get("/{admin_id}", response_model=AdminResponse)
-def get_admin_by_id(admin_id: int, db: Session = Depends(get_db),
-                     current_user: dict = Depends(is_super_admin)):
-    return AdminService.get_admin_by_id(db, admin_id)
+async def get_admin_by_id(admin_id: int, db: AsyncSession = Depends(get_read_db),
+                          current_user: dict = Depends(is_super_admin)):
+    return await AdminService.get_admin_by_id(db, admin_id)
 
 @router.put("/{admin_id}", response_model=AdminResponse)
-def update_client_by_id(admin_id: int, admin_data: AdminRequest, db: Session = Depends(get_db),
-                        current_user: dict = Depends(is_super_admin)):
-    return AdminService.update_admin_by_id(db, admin_id, admin_data.dict())
+async def update_client_by_id(admin_id: int, admin_data: AdminRequest, db: AsyncSession = Depends(get_db),
+                              current_user: dict = Depends(is_super_admin)):
+    return await AdminService.update_admin_by_id(db, admin_id, admin_data.dict())
 
 
 @router.delete("/{admin_id}", status_code=status.HTTP_204_NO_CONTENT)
-def delete_client_by_id(admin_id: int, db: Session = Depends(get_db),
-                        current_user: dict = Depends(is_super_admin)):
-    AdminService.delete_admin_by_id(db, admin_id)
+async def delete_client_by_id(admin_id: int, db: AsyncSession = Depends(get_db),
+                              current_user: dict = Depends(is_super_admin)):
+    await AdminService.delete_admin_by_id(db, admin_id)
@@ -1,16 +1,31 @@
-from fastapi import APIRouter, Depends, status
-from pydantic import BaseModel
-from typing import List
+import os
+from enum import Enum
 
-from sqlalchemy.orm import Session
+from fastapi import APIRouter, Depends, Header, HTTPException, Query, Request, status
+from fastapi.responses import FileResponse, StreamingResponse
+from pydantic import BaseModel, Field
+from typing import List, Optional
 
-from src.app.core.dependencies import get_db
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.app.core.config import get_settings
+from src.app.core.consistency import reads_from_primary
+from src.app.core.dependencies import get_db, get_read_db, read_session
+from src.app.core.exceptions import NotFound
 from src.app.core.jwt_handler import is_super_admin, is_admin_or_super_admin
+from src.app.core.pagination import build_page, decode_cursor, page_limit
+from src.app.core.projection import parse_fields
+from src.app.core.serialization import FastJSONResponse
+from src.app.core.streaming import csv_chunks, gzip_chunks, ndjson_chunks
 from src.app.models.client import Status
-from src.app.services.client import ClientService
+from src.app.services.client import ClientService, CLIENT_FIELDS, client_rows_to_dicts
+from src.app.services.client_changes import client_changes
+from src.app.services.client_import import ClientImportService
 
 router = APIRouter()
 
+MIN_CONTAINS_SEARCH_LENGTH = 3
+
 
 class ClientResponse(BaseModel):
     id: int
@@ -23,38 +38,282 @@ class ClientResponse(BaseModel):
         from_attributes = True
 
 
+class ClientPage(BaseModel):
+    items: List[ClientResponse]
+    next_cursor: Optional[str] = None
+
+
 class ClientRequest(BaseModel):
-    username: str
+    username: str = Field(max_length=20)
     email: str
-    phone: str
+    phone: str = Field(max_length=15)
     status: Status
 
+
+class BulkClientResult(BaseModel):
+    index: int
+    status: str
+    client: Optional[ClientResponse] = None
+    detail: Optional[str] = None
+
+
+class BulkClientResponse(BaseModel):
+    created: int
+    rejected: int
+    results: List[BulkClientResult]
+
+
+class ClientBatchRequest(BaseModel):
+    ids: List[int]
+
+
+class ClientBatchResponse(BaseModel):
+    items: List[ClientResponse]
+    missing: List[int]
+
+
+class BulkStatusRequest(BaseModel):
+    status: Status
+    ids: Optional[List[int]] = None
+    current_status: Optional[Status] = None
+
+
+class BulkStatusResponse(BaseModel):
+    updated: int
+    ids: List[int]
+    has_more: bool
+
+
+class ClientStats(BaseModel):
+    active: int
+    inactive: int
+    suspended: int
+    total: int
+
+
+class ClientChange(BaseModel):
+    cursor: str
+    type: str
+    client: dict
+
+
+class ClientChangesPage(BaseModel):
+    changes: List[ClientChange]
+    cursor: str
+    reset: bool
+
+
+class ImportJobResponse(BaseModel):
+    id: str
+    status: str
+    processed: int
+    created: int
+    rejected: int
+    elapsed_seconds: float
+    rows_per_second: float
+    error: Optional[str] = None
+
+
+class ExportFormat(str, Enum):
+    NDJSON = "ndjson"
+    CSV = "csv"
+
+
+class ClientSort(str, Enum):
+    ID = "id"
+    ID_DESC = "-id"
+    USERNAME = "username"
+    USERNAME_DESC = "-username"
+    EMAIL = "email"
+    EMAIL_DESC = "-email"
+
+
+class SearchMatch(str, Enum):
+    PREFIX = "prefix"
+    CONTAINS = "contains"
+
 @router.post("/create-client", response_model=ClientResponse, status_code=status.HTTP_201_CREATED)
-def create_client(client_data: ClientRequest,
-                  db: Session = Depends(get_db),
-                  current_user: dict = Depends(is_super_admin)):
-    return ClientService.create_client(db, client_data.dict())
+async def create_client(client_data: ClientRequest,
+                        db: AsyncSession = Depends(get_db),
+                        current_user: dict = Depends(is_super_admin)):
+    return await ClientService.create_client(db, client_data.dict())
+
+
+@router.post("/bulk-create", response_model=BulkClientResponse)
+async def bulk_create_clients(clients_data: List[ClientRequest],
+                              db: AsyncSession = Depends(get_db),
+                              current_user: dict = Depends(is_super_admin)):
+    max_items = get_settings().bulk_create_max_items
+    if len(clients_data) > max_items:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"A batch can contain at most {max_items} clients."
+        )
+    results = await ClientService.bulk_create_clients(db, [client_data.dict() for client_data in clients_data])
+    created = sum(1 for result in results if result["status"] == "created")
+    return {"created": created, "rejected": len(results) - created, "results": results}
+
+
+@router.get("/list-clients", response_model=ClientPage)
+async def list_clients(limit: int = Depends(page_limit),
+                       cursor: Optional[str] = None,
+                       fields: Optional[str] = Query(None, description="Comma-separated fields to return."),
+                       client_status: Optional[Status] = Query(None, alias="status"),
+                       search: Optional[str] = Query(None, max_length=100,
+                                                     description="Matches the username or email."),
+                       match: SearchMatch = SearchMatch.PREFIX,
+                       sort: ClientSort = ClientSort.ID,
+                       db: AsyncSession = Depends(get_read_db),
+                       current_user: dict = Depends(is_admin_or_super_admin)):
+    if search and match == SearchMatch.CONTAINS and len(search) < MIN_CONTAINS_SEARCH_LENGTH:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Substring search needs at least {MIN_CONTAINS_SEARCH_LENGTH} characters."
+        )
+    selected = parse_fields(fields, CLIENT_FIELDS)
+    clients = await ClientService.get_all_clients(db, limit + 1, decode_cursor(cursor, sort.value), selected,
+                                                  client_status, search, match.value, sort.value)
+    page = build_page(clients, limit, sort.value)
+    page["items"] = client_rows_to_dicts(page["items"], selected)
+    return FastJSONResponse(page)
+
+
+@router.get("/stats", response_model=ClientStats)
+async def get_client_stats(db: AsyncSession = Depends(get_read_db),
+                           current_user: dict = Depends(is_admin_or_super_admin)):
+    return await ClientService.get_status_counts(db)
+
+
+@router.get("/export", response_class=StreamingResponse)
+async def export_clients(request: Request, format: ExportFormat = ExportFormat.NDJSON, gzip: bool = False,
+                         fields: Optional[str] = Query(None, description="Comma-separated fields to export."),
+                         current_user: dict = Depends(is_admin_or_super_admin)):
+    selected = parse_fields(fields, CLIENT_FIELDS)
+    use_replica = not reads_from_primary(request)
+
+    async def generate():
+        async with read_session(use_replica) as db:
+            partitions = ClientService.iter_clients(db, get_settings().export_chunk_size, selected)
+            chunks = csv_chunks(partitions, selected) if format == ExportFormat.CSV else ndjson_chunks(partitions)
+            async for chunk in chunks:
+                yield chunk
+
+    media_type = "text/csv" if format == ExportFormat.CSV else "application/x-ndjson"
+    headers = {"Content-Disposition": f"attachment; filename=clients.{format.value}"}
+    body = generate()
+    if gzip:
+        headers["Content-Encoding"] = "gzip"
+        body = gzip_chunks(body)
+    return StreamingResponse(body, media_type=media_type, headers=headers)
 
 
-@router.get("/list-clients", response_model=List[ClientResponse])
-def list_clients(db: Session = Depends(get_db),
-                 current_user: dict = Depends(is_admin_or_super_admin)):
-    return ClientService.get_all_clients(db)
+@router.get("/changes", response_class=StreamingResponse)
+async def stream_client_changes(after: Optional[str] = Query(None, max_length=64),
+                                last_event_id: Optional[str] = Header(None, max_length=64),
+                                current_user: dict = Depends(is_admin_or_super_admin)):
+    return StreamingResponse(client_changes.stream(after if after is not None else last_event_id,
+                                                   get_settings().client_changes_heartbeat),
+                             media_type="text/event-stream",
+                             headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"})
+
+
+@router.get("/changes/poll", response_model=ClientChangesPage)
+async def poll_client_changes(after: Optional[str] = Query(None, max_length=64),
+                              wait: float = Query(25, ge=0, le=60),
+                              current_user: dict = Depends(is_admin_or_super_admin)):
+    position = client_changes.cursor if after is None else after
+    changes = client_changes.since(position)
+    if changes == [] and wait:
+        await client_changes.wait(wait)
+        changes = client_changes.since(position)
+    if changes is None:
+        return FastJSONResponse({"changes": [], "cursor": client_changes.cursor, "reset": True})
+    return FastJSONResponse({"changes": changes, "cursor": changes[-1]["cursor"] if changes else position,
+                             "reset": False})
+
+
+@router.post("/import", response_model=ImportJobResponse, status_code=status.HTTP_202_ACCEPTED,
+             openapi_extra={"requestBody": {"required": True,
+                                            "content": {"text/csv": {"schema": {"type": "string"}}}}})
+async def import_clients(request: Request, current_user: dict = Depends(is_super_admin)):
+    job = await ClientImportService.start_import(request.stream(), ClientRequest)
+    return FastJSONResponse(job.to_dict(), status_code=status.HTTP_202_ACCEPTED,
+                            headers={"Location": f"/clients/import/{job.id}"})
+
+
+@router.get("/import/{job_id}", response_model=ImportJobResponse)
+async def get_import_job(job_id: str, current_user: dict = Depends(is_super_admin)):
+    return FastJSONResponse((await ClientImportService.get_job(job_id)).to_dict())
+
+
+@router.get("/import/{job_id}/rejected", response_class=FileResponse)
+async def download_rejected_rows(job_id: str, current_user: dict = Depends(is_super_admin)):
+    job = await ClientImportService.get_job(job_id)
+    if not job.finished:
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail="Import job is still running."
+        )
+    if not os.path.exists(job.rejected_path):
+        raise NotFound("Import job has no rejected rows file.")
+    return FileResponse(job.rejected_path, media_type="text/csv", filename=f"rejected-{job.id}.csv")
+
+
+@router.post("/batch-get", response_model=ClientBatchResponse)
+async def batch_get_clients(batch: ClientBatchRequest,
+                            db: AsyncSession = Depends(get_read_db),
+                            current_user: dict = Depends(is_admin_or_super_admin)):
+    client_ids = list(dict.fromkeys(batch.ids))
+    max_ids = get_settings().batch_get_max_ids
+    if len(client_ids) > max_ids:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"A batch can contain at most {max_ids} ids."
+        )
+    if not client_ids:
+        return FastJSONResponse({"items": [], "missing": []})
+    clients, missing = await ClientService.get_clients_by_ids(db, client_ids)
+    return FastJSONResponse({"items": clients, "missing": missing})
+
+
+@router.post("/bulk-status", response_model=BulkStatusResponse)
+async def bulk_update_status(bulk_status: BulkStatusRequest,
+                             db: AsyncSession = Depends(get_db),
+                             current_user: dict = Depends(is_super_admin)):
+    if bulk_status.ids is None and bulk_status.current_status is None:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Provide ids and/or current_status to select the clients to update."
+        )
+    client_ids = list(dict.fromkeys(bulk_status.ids)) if bulk_status.ids is not None else None
+    max_ids = get_settings().bulk_status_max_ids
+    if client_ids is not None and len(client_ids) > max_ids:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"A batch can contain at most {max_ids} ids."
+        )
+    # Selecting by current_status alone could match a whole cohort; it moves at most max_ids clients per call
+    # and has_more tells the caller to repeat the request for the rest.
+    limit = max_ids if client_ids is None else None
+    updated_ids = await ClientService.update_clients_status(db, bulk_status.status, client_ids,
+                                                            bulk_status.current_status, limit)
+    return FastJSONResponse({"updated": len(updated_ids), "ids": updated_ids,
+                             "has_more": limit is not None and len(updated_ids) == limit})
 
 
 @router.get("/{client_id}", response_model=ClientResponse)
-def get_client_by_id(client_id: int, db: Session = Depends(get_db),
-                     current_user: dict = Depends(is_admin_or_super_admin)):
-    return ClientService.get_client_by_id(db, client_id)
+async def get_client_by_id(client_id: int, db: AsyncSession = Depends(get_read_db),
+                           current_user: dict = Depends(is_admin_or_super_admin)):
+    return await ClientService.get_client_data_by_id(db, client_id)
 
 
 @router.put("/{client_id}", response_model=ClientResponse)
-def update_client_by_id(client_id: int, client_data: ClientRequest, db: Session = Depends(get_db),
-                        current_user: dict = Depends(is_super_admin)):
-    return ClientService.update_client_by_id(db, client_id, client_data.dict())
+async def update_client_by_id(client_id: int, client_data: ClientRequest, db: AsyncSession = Depends(get_db),
+                              current_user: dict = Depends(is_super_admin)):
+    return await ClientService.update_client_by_id(db, client_id, client_data.dict())
 
 
 @router.delete("/{client_id}", status_code=status.HTTP_204_NO_CONTENT)
-def delete_client_by_id(client_id: int, db: Session = Depends(get_db),
-                        current_user: dict = Depends(is_super_admin)):
-    ClientService.delete_client_by_id(db, client_id)
+async def delete_client_by_id(client_id: int, db: AsyncSession = Depends(get_db),
+                              current_user: dict = Depends(is_super_admin)):
+    await ClientService.delete_client_by_id(db, client_id)
@@ -0,0 +1,23 @@
+from fastapi import APIRouter
+from sqlalchemy import text
+from sqlalchemy.exc import SQLAlchemyError
+
+from src.app.core.exceptions import ServiceUnavailable
+from src.app.db.database import get_engine
+
+router = APIRouter()
+
+
+@router.get("/live", summary="The process is up and serving requests")
+async def live():
+    return {"status": "ok"}
+
+
+@router.get("/ready", summary="The worker has started and can reach the database")
+async def ready():
+    try:
+        async with get_engine().connect() as connection:
+            await connection.execute(text("SELECT 1"))
+    except (RuntimeError, SQLAlchemyError, OSError):
+        raise ServiceUnavailable("Not ready.")
+    return {"status": "ready"}
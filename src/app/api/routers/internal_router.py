@@ -0,0 +1,11 @@
+from fastapi import APIRouter, Depends
+
+from src.app.core.jwt_handler import is_super_admin
+from src.app.db.database import pool_status
+
+router = APIRouter()
+
+
+@router.get("/db-pool", summary="Connection pool usage and checkout latency")
+async def get_db_pool_status(current_user: dict = Depends(is_super_admin)):
+    return pool_status()
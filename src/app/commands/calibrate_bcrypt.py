@@ -0,0 +1,43 @@
+import argparse
+import json
+import statistics
+import time
+
+from passlib.hash import bcrypt
+
+
+def measure_verify(rounds: int, samples: int) -> float:
+    handler = bcrypt.using(rounds=rounds)
+    hashed_password = handler.hash("calibration-password")
+    timings = []
+    for _ in range(samples):
+        started = time.perf_counter()
+        handler.verify("calibration-password", hashed_password)
+        timings.append(time.perf_counter() - started)
+    return statistics.median(timings)
+
+
+def calibrate(target_ms: float, samples: int, min_rounds: int = 4, max_rounds: int = 16) -> dict:
+    timings = {}
+    rounds = min_rounds
+    for candidate in range(min_rounds, max_rounds + 1):
+        timings[candidate] = round(measure_verify(candidate, samples) * 1000, 2)
+        if timings[candidate] > target_ms:
+            break
+        rounds = candidate
+    return {"rounds": rounds, "target_ms": target_ms, "verify_ms": timings}
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Pick the bcrypt rounds whose verify time fits a latency target.")
+    parser.add_argument("--target-ms", type=float, default=250, help="Highest acceptable verify latency.")
+    parser.add_argument("--samples", type=int, default=5, help="Verifications timed per rounds value.")
+    parser.add_argument("--max-rounds", type=int, default=16)
+    return parser.parse_args()
+
+
+if __name__ == "__main__":
+    args = parse_args()
+    result = calibrate(args.target_ms, args.samples, max_rounds=args.max_rounds)
+    print(json.dumps(result))
+    print(f"BCRYPT_ROUNDS={result['rounds']}")
@@ -0,0 +1,21 @@
+import asyncio
+import json
+
+from src.app.db.database import SessionLocal, dispose_engine, init_engine
+from src.app.models.client_status_count import ClientStatusCount
+from src.app.services.client import ClientService
+
+
+async def reconcile() -> dict:
+    engine = init_engine()
+    try:
+        async with engine.begin() as connection:
+            await connection.run_sync(ClientStatusCount.__table__.create, checkfirst=True)
+        async with SessionLocal() as db:
+            return await ClientService.reconcile_status_counts(db)
+    finally:
+        await dispose_engine()
+
+
+if __name__ == "__main__":
+    print(json.dumps(asyncio.run(reconcile())))
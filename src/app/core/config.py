@@ -1,16 +1,204 @@
+import json
 import os
+import tempfile
+from dataclasses import dataclass, field
+from functools import lru_cache
+from typing import Optional, Tuple
 
 from dotenv import load_dotenv
 
 load_dotenv()
 
-DB_USER = os.getenv("POSTGRES_USER")
-DB_PASSWORD = os.getenv("POSTGRES_PASSWORD")
-DB_NAME = os.getenv("POSTGRES_DB")
-DB_HOST = os.getenv("POSTGRES_HOST")
-DB_PORT = os.getenv("POSTGRES_PORT")
+SCHEMA_BOOTSTRAP_MODES = ("none", "create", "reset")
+IDEMPOTENCY_BACKENDS = ("none", "memory", "database")
+# Postgres' default max_connections minus its superuser_reserved_connections.
+DEFAULT_DB_MAX_CONNECTIONS = 97
+
+
+@dataclass(frozen=True)
+class Settings:
+    db_user: Optional[str] = None
+    db_password: Optional[str] = None
+    db_name: Optional[str] = None
+    db_host: Optional[str] = None
+    db_port: Optional[str] = None
+    database_url: Optional[str] = None
+    database_replica_urls: Tuple[str, ...] = ()
+    replica_retry_after: float = 30
+    read_your_writes_seconds: int = 5
+
+    db_pool_size: int = 5
+    db_max_overflow: int = 10
+    db_pool_timeout: float = 30
+    db_pool_recycle: int = 1800
+    db_pool_pre_ping: bool = True
+    db_max_connections: Optional[int] = None
+
+    app_host: str = "0.0.0.0"
+    app_port: int = 8000
+    web_concurrency: Optional[int] = None
+    server_loop: str = "auto"
+    server_http: str = "auto"
+    graceful_timeout: int = 30
+
+    environment_type: Optional[str] = None
+    schema_bootstrap: str = "none"
+
+    client_changes_notify: bool = False
+
+    idempotency_backend: str = "memory"
+    idempotency_store_size: int = 10000
+    idempotency_ttl: float = 86400
+    idempotency_lock_timeout: float = 60
+    idempotency_wait_timeout: float = 10
+
+    default_page_size: int = 50
+    max_page_size: int = 500
+    export_chunk_size: int = 1000
+    bulk_create_max_items: int = 5000
+    batch_get_max_ids: int = 500
+    bulk_status_max_ids: int = 5000
+    client_status_count_shards: int = 8
+
+    client_import_chunk_size: int = 1000
+    client_import_max_bytes: int = 100 * 1024 * 1024
+    client_import_concurrency: int = 1
+    client_import_max_jobs: int = 100
+    client_import_dir: str = field(default_factory=lambda: os.path.join(tempfile.gettempdir(), "client-imports"))
+
+    bcrypt_rounds: int = 12
+    hashing_pool_size: int = field(default_factory=lambda: os.cpu_count() or 1)
+    hashing_queue_limit: int = 64
+
+    token_cache_size: int = 10000
+    client_cache_enabled: bool = False
+    client_cache_size: int = 10000
+    client_cache_ttl: float = 30
+
+    client_changes_buffer_size: int = 10000
+    client_changes_heartbeat: float = 15
+    client_changes_retry: float = 1
+
+    db_debug_headers: bool = False
+    query_budgets: Tuple[Tuple[str, int], ...] = ()
+    query_budget_default: Optional[int] = None
+
+    super_admin_email: Optional[str] = None
+    super_admin_username: Optional[str] = None
+    super_admin_password: Optional[str] = None
+
+    @property
+    def sqlalchemy_database_url(self) -> str:
+        return self.database_url or (
+            f"postgresql+asyncpg://{self.db_user}:{self.db_password}@{self.db_host}:{self.db_port}/{self.db_name}"
+        )
+
+    @classmethod
+    def from_env(cls) -> "Settings":
+        environment_type = os.getenv("ENVIRONMENT_TYPE")
+        schema_bootstrap = os.getenv("SCHEMA_BOOTSTRAP", "reset" if environment_type == "development" else "none")
+        if schema_bootstrap not in SCHEMA_BOOTSTRAP_MODES:
+            raise ValueError(f"SCHEMA_BOOTSTRAP must be one of {', '.join(SCHEMA_BOOTSTRAP_MODES)}.")
+        idempotency_backend = os.getenv("IDEMPOTENCY_BACKEND", "memory").lower()
+        if idempotency_backend not in IDEMPOTENCY_BACKENDS:
+            raise ValueError(f"IDEMPOTENCY_BACKEND must be one of {', '.join(IDEMPOTENCY_BACKENDS)}.")
+        bcrypt_rounds = int(os.getenv("BCRYPT_ROUNDS", 12))
+        if not 4 <= bcrypt_rounds <= 31:
+            raise ValueError("BCRYPT_ROUNDS must be between 4 and 31.")
+
+        web_concurrency = int(os.getenv("WEB_CONCURRENCY")) if os.getenv("WEB_CONCURRENCY") else None
+        database_replica_urls = tuple(
+            url.strip() for url in os.getenv("SQLALCHEMY_REPLICA_URLS", "").split(",") if url.strip()
+        )
+        client_changes_notify = os.getenv("CLIENT_CHANGES_NOTIFY", "false").lower() == "true"
+        db_max_connections = int(os.getenv("DB_MAX_CONNECTIONS")) if os.getenv("DB_MAX_CONNECTIONS") else None
+        query_budget_default = int(os.getenv("QUERY_BUDGET_DEFAULT")) if os.getenv("QUERY_BUDGET_DEFAULT") else None
+
+        # Every worker opens one pool per engine (primary and replicas) plus the change feed's LISTEN connection,
+        # which lives outside the pools, and all of them must fit in the server's connection limit.
+        per_worker = (db_max_connections or DEFAULT_DB_MAX_CONNECTIONS) // (web_concurrency or 1)
+        per_engine = max(1, (per_worker - client_changes_notify) // (1 + len(database_replica_urls)))
+        db_pool_size = min(int(os.getenv("DB_POOL_SIZE", 5)), per_engine)
+        db_max_overflow = min(int(os.getenv("DB_MAX_OVERFLOW", 10)), per_engine - db_pool_size)
+
+        return cls(
+            db_user=os.getenv("POSTGRES_USER"),
+            db_password=os.getenv("POSTGRES_PASSWORD"),
+            db_name=os.getenv("POSTGRES_DB"),
+            db_host=os.getenv("POSTGRES_HOST"),
+            db_port=os.getenv("POSTGRES_PORT"),
+            database_url=os.getenv("SQLALCHEMY_DATABASE_URL"),
+            database_replica_urls=database_replica_urls,
+            replica_retry_after=float(os.getenv("REPLICA_RETRY_AFTER", 30)),
+            read_your_writes_seconds=int(os.getenv("READ_YOUR_WRITES_SECONDS", 5)),
+            db_pool_size=db_pool_size,
+            db_max_overflow=db_max_overflow,
+            db_pool_timeout=float(os.getenv("DB_POOL_TIMEOUT", 30)),
+            db_pool_recycle=int(os.getenv("DB_POOL_RECYCLE", 1800)),
+            db_pool_pre_ping=os.getenv("DB_POOL_PRE_PING", "true").lower() == "true",
+            db_max_connections=db_max_connections,
+            app_host=os.getenv("APP_HOST", "0.0.0.0"),
+            app_port=int(os.getenv("APP_PORT", 8000)),
+            web_concurrency=web_concurrency,
+            server_loop=os.getenv("SERVER_LOOP", "auto"),
+            server_http=os.getenv("SERVER_HTTP", "auto"),
+            graceful_timeout=int(os.getenv("GRACEFUL_TIMEOUT", 30)),
+            environment_type=environment_type,
+            schema_bootstrap=schema_bootstrap,
+            client_changes_notify=client_changes_notify,
+            idempotency_backend=idempotency_backend,
+            idempotency_store_size=int(os.getenv("IDEMPOTENCY_STORE_SIZE", 10000)),
+            idempotency_ttl=float(os.getenv("IDEMPOTENCY_TTL", 86400)),
+            idempotency_lock_timeout=float(os.getenv("IDEMPOTENCY_LOCK_TIMEOUT", 60)),
+            idempotency_wait_timeout=float(os.getenv("IDEMPOTENCY_WAIT_TIMEOUT", 10)),
+            default_page_size=int(os.getenv("DEFAULT_PAGE_SIZE", 50)),
+            max_page_size=int(os.getenv("MAX_PAGE_SIZE", 500)),
+            export_chunk_size=int(os.getenv("EXPORT_CHUNK_SIZE", 1000)),
+            bulk_create_max_items=int(os.getenv("BULK_CREATE_MAX_ITEMS", 5000)),
+            batch_get_max_ids=int(os.getenv("BATCH_GET_MAX_IDS", 500)),
+            bulk_status_max_ids=int(os.getenv("BULK_STATUS_MAX_IDS", 5000)),
+            client_status_count_shards=int(os.getenv("CLIENT_STATUS_COUNT_SHARDS", 8)),
+            client_import_chunk_size=int(os.getenv("CLIENT_IMPORT_CHUNK_SIZE", 1000)),
+            client_import_max_bytes=int(os.getenv("CLIENT_IMPORT_MAX_BYTES", 100 * 1024 * 1024)),
+            client_import_concurrency=int(os.getenv("CLIENT_IMPORT_CONCURRENCY", 1)),
+            client_import_max_jobs=int(os.getenv("CLIENT_IMPORT_MAX_JOBS", 100)),
+            client_import_dir=os.getenv("CLIENT_IMPORT_DIR") or os.path.join(tempfile.gettempdir(), "client-imports"),
+            bcrypt_rounds=bcrypt_rounds,
+            hashing_pool_size=int(os.getenv("HASHING_POOL_SIZE")
+                                  or max(1, (os.cpu_count() or 1) // (web_concurrency or 1))),
+            hashing_queue_limit=int(os.getenv("HASHING_QUEUE_LIMIT", 64)),
+            token_cache_size=int(os.getenv("TOKEN_CACHE_SIZE", 10000)),
+            client_cache_enabled=os.getenv("CLIENT_CACHE_ENABLED", "false").lower() == "true",
+            client_cache_size=int(os.getenv("CLIENT_CACHE_SIZE", 10000)),
+            client_cache_ttl=float(os.getenv("CLIENT_CACHE_TTL", 30)),
+            client_changes_buffer_size=int(os.getenv("CLIENT_CHANGES_BUFFER_SIZE", 10000)),
+            client_changes_heartbeat=float(os.getenv("CLIENT_CHANGES_HEARTBEAT", 15)),
+            client_changes_retry=float(os.getenv("CLIENT_CHANGES_RETRY", 1)),
+            db_debug_headers=os.getenv("DB_DEBUG_HEADERS", "false").lower() == "true",
+            query_budgets=tuple(json.loads(os.getenv("QUERY_BUDGETS") or "{}").items()),
+            query_budget_default=query_budget_default,
+            super_admin_email=os.getenv("SUPER_ADMIN_EMAIL"),
+            super_admin_username=os.getenv("SUPER_ADMIN_USERNAME"),
+            super_admin_password=os.getenv("SUPER_ADMIN_PASSWORD"),
+        )
+
+
+_active_settings: Optional[Settings] = None
+
+
+@lru_cache
+def _settings_from_env() -> Settings:
+    return Settings.from_env()
+
+
+def get_settings() -> Settings:
+    return _active_settings or _settings_from_env()
+
+
+def use_settings(settings: Optional[Settings]) -> None:
+    global _active_settings
+    _active_settings = settings
 
-ENVIRONMENT_TYPE = os.getenv("ENVIRONMENT_TYPE")
 
 SECRET_KEY = os.getenv("SECRET_KEY")
 ALGORITHM = os.getenv("ALGORITHM", "HS256")
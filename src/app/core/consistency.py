@@ -0,0 +1,25 @@
+READ_PRIMARY_COOKIE = "read_primary"
+READ_PRIMARY_HEADER = "x-read-primary"
+SAFE_METHODS = ("GET", "HEAD", "OPTIONS")
+
+
+def reads_from_primary(request) -> bool:
+    return READ_PRIMARY_COOKIE in request.cookies or request.headers.get(READ_PRIMARY_HEADER) == "1"
+
+
+class ReadYourWritesMiddleware:
+    def __init__(self, app, max_age: int):
+        self.app = app
+        self.cookie = f"{READ_PRIMARY_COOKIE}=1; Max-Age={max_age}; Path=/; HttpOnly; SameSite=Lax".encode()
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or scope["method"] in SAFE_METHODS:
+            await self.app(scope, receive, send)
+            return
+
+        async def send_with_cookie(message):
+            if message["type"] == "http.response.start" and message["status"] < 400:
+                message["headers"] = list(message.get("headers", [])) + [(b"set-cookie", self.cookie)]
+            await send(message)
+
+        await self.app(scope, receive, send_with_cookie)
@@ -1,9 +1,61 @@
-from src.app.db.database import SessionLocal
+import time
+from contextlib import asynccontextmanager
 
+from fastapi import Request
+from sqlalchemy.exc import SQLAlchemyError, TimeoutError as PoolTimeoutError
 
-def get_db():
-    db = SessionLocal()
+from src.app.core.consistency import reads_from_primary
+from src.app.core.exceptions import ServiceUnavailable
+from src.app.db.database import SessionLocal, get_replicas, pool_checkout_seconds, pool_checkout_timeouts
+
+
+async def _checkout(db):
+    started = time.perf_counter()
     try:
+        await db.connection()
+    except PoolTimeoutError:
+        pool_checkout_timeouts.inc()
+        raise ServiceUnavailable("Database connection pool exhausted. Try again later.")
+    pool_checkout_seconds.observe(time.perf_counter() - started)
+
+
+async def _replica_session():
+    replicas = get_replicas()
+    for replica in replicas.candidates():
+        db = SessionLocal(bind=replica)
+        try:
+            await db.connection()
+        except PoolTimeoutError:
+            await db.close()
+            continue
+        except (OSError, SQLAlchemyError):
+            await db.close()
+            replicas.mark_unhealthy(replica)
+            continue
+        return db
+    return None
+
+
+@asynccontextmanager
+async def read_session(use_replica: bool = True):
+    db = await _replica_session() if use_replica else None
+    if db is None:
+        db = SessionLocal()
+        try:
+            await _checkout(db)
+        except BaseException:
+            await db.close()
+            raise
+    async with db:
+        yield db
+
+
+async def get_db():
+    async with SessionLocal() as db:
+        await _checkout(db)
+        yield db
+
+
+async def get_read_db(request: Request):
+    async with read_session(not reads_from_primary(request)) as db:
         yield db
-    finally:
-        db.close()
@@ -1,6 +1,46 @@
 from fastapi import HTTPException, status
+from sqlalchemy import or_, select
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
 
 
 class NotFound(HTTPException):
     def __init__(self, detail: str = "Not found."):
         super().__init__(status_code=status.HTTP_404_NOT_FOUND, detail=detail)
+
+
+class ServiceUnavailable(HTTPException):
+    def __init__(self, detail: str = "Service unavailable.", retry_after: int = 1):
+        super().__init__(status_code=status.HTTP_503_SERVICE_UNAVAILABLE, detail=detail,
+                         headers={"Retry-After": str(retry_after)})
+
+
+def unique_violation(error: IntegrityError) -> HTTPException:
+    message = str(error.orig).splitlines()[0].lower()
+    validation_errors = []
+
+    if "email" in message:
+        validation_errors.append("Email already registered.")
+    if "username" in message:
+        validation_errors.append("Username already taken.")
+
+    return HTTPException(
+        status_code=status.HTTP_400_BAD_REQUEST,
+        detail="; ".join(validation_errors) or "Data conflicts with an existing record."
+    )
+
+
+async def describe_unique_violation(db: AsyncSession, model, record_id: int, values: dict,
+                                    error: IntegrityError) -> HTTPException:
+    # The database only names the first constraint it hit; look both fields up so every conflict is reported.
+    owners = (await db.execute(select(model.email, model.username).where(
+        model.id != record_id, or_(model.email == values["email"], model.username == values["username"])
+    ))).all()
+    validation_errors = []
+    if any(owner.email == values["email"] for owner in owners):
+        validation_errors.append("Email already registered.")
+    if any(owner.username == values["username"] for owner in owners):
+        validation_errors.append("Username already taken.")
+    if not validation_errors:
+        return unique_violation(error)
+    return HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="; ".join(validation_errors))
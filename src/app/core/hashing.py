@@ -1,11 +1,110 @@
+import asyncio
+import multiprocessing
+import time
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Optional, Tuple
+
 from passlib.context import CryptContext
 
+from src.app.core.config import get_settings
+from src.app.core.exceptions import ServiceUnavailable
+from src.app.core.metrics import Counter, Gauge, Histogram
+
 pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
 
+_executor: Optional[ProcessPoolExecutor] = None
+_pending = 0
+
+password_hashing_seconds = Histogram("password_hashing_seconds", "bcrypt call latency, including pool queueing.",
+                                     ("operation",))
+password_hashing_rejected = Counter("password_hashing_rejected_total", "bcrypt calls rejected with 503.")
+password_hashing_pool_restarts = Counter("password_hashing_pool_restarts_total",
+                                         "bcrypt pools replaced after a worker process died.")
+Gauge("password_hashing_pending", "bcrypt calls running or queued.", function=lambda: _pending)
+
 
-def hash_password(password: str) -> str:
+def _init_hashing_process(rounds: int) -> None:
+    global pwd_context
+    pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto", bcrypt__rounds=rounds)
+
+
+def _hash_password(password: str) -> str:
     return pwd_context.hash(password)
 
 
-def verify_password(plain_password: str, hashed_password: str) -> bool:
+def _verify_password(plain_password: str, hashed_password: str) -> bool:
     return pwd_context.verify(plain_password, hashed_password)
+
+
+def _verify_and_update_password(plain_password: str, hashed_password: str) -> Tuple[bool, Optional[str]]:
+    return pwd_context.verify_and_update(plain_password, hashed_password)
+
+
+def _mp_context():
+    # Forking would copy the event loop and the database driver threads into the workers.
+    if "forkserver" not in multiprocessing.get_all_start_methods():
+        return multiprocessing.get_context("spawn")
+    context = multiprocessing.get_context("forkserver")
+    context.set_forkserver_preload([__name__])
+    return context
+
+
+def get_hashing_executor() -> ProcessPoolExecutor:
+    global _executor
+    if _executor is None:
+        settings = get_settings()
+        _executor = ProcessPoolExecutor(max_workers=settings.hashing_pool_size, mp_context=_mp_context(),
+                                        initializer=_init_hashing_process, initargs=(settings.bcrypt_rounds,))
+    return _executor
+
+
+def _discard_broken_executor(executor: ProcessPoolExecutor) -> None:
+    global _executor
+    if _executor is executor:
+        _executor = None
+        password_hashing_pool_restarts.inc()
+    executor.shutdown(wait=False, cancel_futures=True)
+
+
+def shutdown_hashing_executor() -> None:
+    global _executor
+    if _executor is not None:
+        _executor.shutdown(wait=False, cancel_futures=True)
+        _executor = None
+
+
+async def _run_in_pool(operation: str, func, *args):
+    global _pending
+    settings = get_settings()
+    if _pending >= settings.hashing_pool_size + settings.hashing_queue_limit:
+        password_hashing_rejected.inc()
+        raise ServiceUnavailable("Authentication service is busy. Try again later.")
+
+    _pending += 1
+    started = time.perf_counter()
+    try:
+        loop = asyncio.get_running_loop()
+        # A worker killed mid-call (OOM, segfault) breaks the whole pool; start a fresh one and try once more.
+        for _ in range(2):
+            executor = get_hashing_executor()
+            try:
+                return await loop.run_in_executor(executor, func, *args)
+            except BrokenProcessPool:
+                _discard_broken_executor(executor)
+        raise ServiceUnavailable("Authentication service is unavailable. Try again later.")
+    finally:
+        _pending -= 1
+        password_hashing_seconds.labels(operation).observe(time.perf_counter() - started)
+
+
+async def hash_password(password: str) -> str:
+    return await _run_in_pool("hash", _hash_password, password)
+
+
+async def verify_password(plain_password: str, hashed_password: str) -> bool:
+    return await _run_in_pool("verify", _verify_password, plain_password, hashed_password)
+
+
+async def verify_and_update_password(plain_password: str, hashed_password: str) -> Tuple[bool, Optional[str]]:
+    return await _run_in_pool("verify", _verify_and_update_password, plain_password, hashed_password)
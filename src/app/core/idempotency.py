@@ -0,0 +1,277 @@
+import asyncio
+import hashlib
+import json
+import time
+from typing import Optional
+
+from fastapi import HTTPException
+from sqlalchemy import delete, insert, or_, select, update
+from sqlalchemy.exc import IntegrityError
+from starlette.routing import Match
+
+from src.app.core.cache import LRUCache
+from src.app.core.config import Settings
+from src.app.core.jwt_handler import verify_token
+from src.app.core.metrics import Counter
+from src.app.core.serialization import dumps
+from src.app.db.database import SessionLocal
+from src.app.models.idempotency_key import IdempotencyKey
+
+IDEMPOTENCY_HEADER = b"idempotency-key"
+IDEMPOTENT_ROUTES = {
+    ("POST", "/clients/create-client"),
+    ("POST", "/clients/bulk-create"),
+    ("POST", "/clients/bulk-status"),
+    ("PUT", "/clients/{client_id}"),
+    ("PUT", "/admins/{admin_id}"),
+    ("POST", "/security/create-admin"),
+}
+MAX_KEY_LENGTH = 255
+POLL_INTERVAL = 0.05
+PURGE_INTERVAL = 60
+
+idempotency_replays = Counter("idempotency_replays_total", "Responses replayed for a repeated Idempotency-Key.")
+
+
+class IdempotencyRecord:
+    __slots__ = ("fingerprint", "status", "headers", "body")
+
+    def __init__(self, fingerprint: str, status: Optional[int] = None, headers: list = (), body: bytes = b""):
+        self.fingerprint = fingerprint
+        self.status = status
+        self.headers = list(headers)
+        self.body = body
+
+
+class IdempotencyStore:
+    async def reserve(self, key: str, fingerprint: str) -> Optional[IdempotencyRecord]:
+        raise NotImplementedError
+
+    async def complete(self, key: str, record: IdempotencyRecord) -> None:
+        raise NotImplementedError
+
+    async def release(self, key: str) -> None:
+        raise NotImplementedError
+
+    async def wait(self, key: str, timeout: float) -> None:
+        await asyncio.sleep(min(POLL_INTERVAL, timeout))
+
+
+class InMemoryIdempotencyStore(IdempotencyStore):
+    def __init__(self, max_size: int, ttl: float, lock_timeout: float):
+        self.ttl = ttl
+        self.lock_timeout = lock_timeout
+        self._records = LRUCache(max_size)
+        self._in_flight: dict[str, asyncio.Event] = {}
+
+    async def reserve(self, key: str, fingerprint: str) -> Optional[IdempotencyRecord]:
+        record = self._records.get(key)
+        if record is not None:
+            return record
+        self._records.set(key, IdempotencyRecord(fingerprint), expires_at=time.time() + self.lock_timeout)
+        self._in_flight[key] = asyncio.Event()
+        return None
+
+    async def complete(self, key: str, record: IdempotencyRecord) -> None:
+        self._records.set(key, record, expires_at=time.time() + self.ttl)
+        self._wake(key)
+
+    async def release(self, key: str) -> None:
+        self._records.delete(key)
+        self._wake(key)
+
+    async def wait(self, key: str, timeout: float) -> None:
+        event = self._in_flight.get(key)
+        if event is None:
+            return await super().wait(key, timeout)
+        try:
+            await asyncio.wait_for(event.wait(), timeout)
+        except asyncio.TimeoutError:
+            pass
+
+    def _wake(self, key: str) -> None:
+        event = self._in_flight.pop(key, None)
+        if event is not None:
+            event.set()
+
+
+class DatabaseIdempotencyStore(IdempotencyStore):
+    def __init__(self, ttl: float, lock_timeout: float):
+        self.ttl = ttl
+        self.lock_timeout = lock_timeout
+        self._purged_at = 0.0
+
+    async def reserve(self, key: str, fingerprint: str) -> Optional[IdempotencyRecord]:
+        now = time.time()
+        purge = now - self._purged_at >= PURGE_INTERVAL
+        async with SessionLocal() as db:
+            await db.execute(delete(IdempotencyKey).where(
+                IdempotencyKey.expires_at <= now, or_(purge, IdempotencyKey.key == key)
+            ))
+            try:
+                await db.execute(insert(IdempotencyKey).values(
+                    key=key, fingerprint=fingerprint, expires_at=now + self.lock_timeout
+                ))
+                await db.commit()
+            except IntegrityError:
+                await db.rollback()
+                row = (await db.execute(select(IdempotencyKey).where(IdempotencyKey.key == key))).scalar()
+                if row is None:
+                    return IdempotencyRecord(fingerprint)
+                return IdempotencyRecord(row.fingerprint, row.status_code,
+                                         [tuple(h.encode("latin-1") for h in pair)
+                                          for pair in json.loads(row.headers or "[]")],
+                                         row.body or b"")
+        if purge:
+            self._purged_at = now
+        return None
+
+    async def complete(self, key: str, record: IdempotencyRecord) -> None:
+        headers = json.dumps([[name.decode("latin-1"), value.decode("latin-1")] for name, value in record.headers])
+        async with SessionLocal() as db:
+            await db.execute(update(IdempotencyKey).where(IdempotencyKey.key == key).values(
+                status_code=record.status, headers=headers, body=record.body, expires_at=time.time() + self.ttl
+            ))
+            await db.commit()
+
+    async def release(self, key: str) -> None:
+        async with SessionLocal() as db:
+            await db.execute(delete(IdempotencyKey).where(IdempotencyKey.key == key))
+            await db.commit()
+
+
+def build_idempotency_store(settings: Settings) -> Optional[IdempotencyStore]:
+    if settings.idempotency_backend == "memory":
+        return InMemoryIdempotencyStore(settings.idempotency_store_size, settings.idempotency_ttl,
+                                        settings.idempotency_lock_timeout)
+    if settings.idempotency_backend == "database":
+        return DatabaseIdempotencyStore(settings.idempotency_ttl, settings.idempotency_lock_timeout)
+    return None
+
+
+def _header(scope, name: bytes) -> Optional[str]:
+    for key, value in scope["headers"]:
+        if key == name:
+            return value.decode("latin-1")
+    return None
+
+
+def _match_route(scope):
+    for route in scope["app"].router.routes:
+        match, _ = route.matches(scope)
+        if match == Match.FULL:
+            return route if (scope["method"], route.path) in IDEMPOTENT_ROUTES else None
+    return None
+
+
+def _principal(scope) -> Optional[str]:
+    scheme, _, token = (_header(scope, b"authorization") or "").partition(" ")
+    if scheme.lower() != "bearer" or not token:
+        return None
+    try:
+        payload = verify_token(token)
+    except HTTPException:
+        return None
+    return f"{payload.get('role')}:{payload.get('sub')}"
+
+
+async def _read_body(receive) -> bytes:
+    chunks = []
+    while True:
+        message = await receive()
+        if message["type"] != "http.request":
+            break
+        chunks.append(message.get("body", b""))
+        if not message.get("more_body", False):
+            break
+    return b"".join(chunks)
+
+
+async def _send_response(send, status: int, headers: list, body: bytes) -> None:
+    await send({"type": "http.response.start", "status": status, "headers": headers})
+    await send({"type": "http.response.body", "body": body})
+
+
+async def _send_error(send, status: int, detail: str) -> None:
+    body = dumps({"detail": detail})
+    await _send_response(send, status, [(b"content-type", b"application/json"),
+                                        (b"content-length", str(len(body)).encode())], body)
+
+
+class IdempotencyMiddleware:
+    def __init__(self, app, store: IdempotencyStore, wait_timeout: float):
+        self.app = app
+        self.store = store
+        self.wait_timeout = wait_timeout
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or scope["method"] not in ("POST", "PUT", "PATCH", "DELETE"):
+            await self.app(scope, receive, send)
+            return
+        key = _header(scope, IDEMPOTENCY_HEADER)
+        route = _match_route(scope) if key is not None else None
+        principal = _principal(scope) if route is not None else None
+        if principal is None:
+            await self.app(scope, receive, send)
+            return
+        if not key or len(key) > MAX_KEY_LENGTH:
+            await _send_error(send, 400, f"Idempotency-Key must have between 1 and {MAX_KEY_LENGTH} characters.")
+            return
+
+        body = await _read_body(receive)
+        fingerprint = hashlib.sha256(b"\n".join(
+            [scope["method"].encode(), scope["path"].encode(), scope.get("query_string", b""), body]
+        )).hexdigest()
+        store_key = hashlib.sha256(f"{principal}\n{key}".encode()).hexdigest()
+        deadline = time.monotonic() + self.wait_timeout
+
+        while True:
+            record = await self.store.reserve(store_key, fingerprint)
+            if record is None:
+                await self._run(scope, receive, send, body, store_key, fingerprint)
+                return
+            if record.fingerprint != fingerprint:
+                await _send_error(send, 422, "Idempotency-Key was already used with a different request.")
+                return
+            if record.status is not None:
+                scope["route"] = route
+                idempotency_replays.inc()
+                await _send_response(send, record.status, record.headers + [(b"idempotent-replayed", b"true")],
+                                     record.body)
+                return
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                await _send_error(send, 409, "A request with this Idempotency-Key is still in progress.")
+                return
+            await self.store.wait(store_key, remaining)
+
+    async def _run(self, scope, receive, send, body: bytes, store_key: str, fingerprint: str) -> None:
+        record = IdempotencyRecord(fingerprint)
+        chunks = []
+        body_sent = False
+
+        async def receive_body():
+            nonlocal body_sent
+            if body_sent:
+                return await receive()
+            body_sent = True
+            return {"type": "http.request", "body": body, "more_body": False}
+
+        async def send_and_capture(message):
+            if message["type"] == "http.response.start":
+                record.status = message["status"]
+                record.headers = list(message.get("headers", []))
+            elif message["type"] == "http.response.body":
+                chunks.append(message.get("body", b""))
+            await send(message)
+
+        try:
+            await self.app(scope, receive_body, send_and_capture)
+        except BaseException:
+            await self.store.release(store_key)
+            raise
+        if record.status is not None and record.status < 500:
+            record.body = b"".join(chunks)
+            await self.store.complete(store_key, record)
+        else:
+            await self.store.release(store_key)
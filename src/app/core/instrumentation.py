@@ -0,0 +1,106 @@
+import time
+from contextvars import ContextVar
+from typing import Optional
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+from src.app.core.config import get_settings
+from src.app.core.metrics import Counter, DEFAULT_COUNT_BUCKETS, Gauge, Histogram
+from src.app.core.query_budget import check_query_budget, get_query_budget
+
+
+class RequestStats:
+    __slots__ = ("queries", "db_time")
+
+    def __init__(self):
+        self.queries = 0
+        self.db_time = 0.0
+
+
+current_request_stats: ContextVar[Optional[RequestStats]] = ContextVar("current_request_stats", default=None)
+
+http_requests_in_flight = Gauge("http_requests_in_flight", "Requests currently being served.")
+http_requests_total = Counter("http_requests_total", "Responses sent, by route and status code.",
+                              ("method", "route", "status"))
+http_request_duration_seconds = Histogram("http_request_duration_seconds", "Request latency by route.",
+                                          ("method", "route"))
+http_request_db_queries = Histogram("http_request_db_queries", "SQL statements executed per request.",
+                                    ("method", "route"), buckets=DEFAULT_COUNT_BUCKETS)
+http_request_db_seconds = Histogram("http_request_db_seconds", "Time spent in SQL per request.",
+                                    ("method", "route"))
+db_statements_total = Counter("db_statements_total", "SQL statements executed.")
+db_statement_duration_seconds = Histogram("db_statement_duration_seconds", "SQL statement latency.")
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    context._query_started = time.perf_counter()
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    elapsed = time.perf_counter() - context._query_started
+    db_statements_total.inc()
+    db_statement_duration_seconds.observe(elapsed)
+    stats = current_request_stats.get()
+    if stats is not None:
+        stats.queries += 1
+        stats.db_time += elapsed
+
+
+def instrument_engine(engine: Engine) -> None:
+    event.listen(engine, "before_cursor_execute", _before_cursor_execute)
+    event.listen(engine, "after_cursor_execute", _after_cursor_execute)
+
+
+def _route_path(scope) -> str:
+    route = scope.get("route")
+    return route.path if route is not None else "unmatched"
+
+
+def _debug_headers(scope, stats: RequestStats) -> list:
+    headers = [
+        (b"x-db-queries", str(stats.queries).encode()),
+        (b"x-db-time-ms", f"{stats.db_time * 1000:.2f}".encode()),
+    ]
+    budget = get_query_budget(scope["method"], _route_path(scope))
+    if budget is not None:
+        headers.append((b"x-db-query-budget", str(budget).encode()))
+    return headers
+
+
+class MetricsMiddleware:
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        stats = RequestStats()
+        token = current_request_stats.set(stats)
+        status_code = 500
+
+        async def send_with_status(message):
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+                if get_settings().db_debug_headers:
+                    message["headers"] = list(message.get("headers", [])) + _debug_headers(scope, stats)
+            await send(message)
+
+        http_requests_in_flight.inc()
+        started = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            elapsed = time.perf_counter() - started
+            http_requests_in_flight.dec()
+            current_request_stats.reset(token)
+
+            labels = (scope["method"], _route_path(scope))
+            http_request_duration_seconds.labels(*labels).observe(elapsed)
+            http_requests_total.labels(*labels, str(status_code)).inc()
+            http_request_db_queries.labels(*labels).observe(stats.queries)
+            http_request_db_seconds.labels(*labels).observe(stats.db_time)
+            check_query_budget(*labels, stats.queries)
@@ -1,19 +1,28 @@
+import hashlib
+import secrets
 from datetime import datetime, timedelta, timezone
 from typing import Optional
 from fastapi.security import OAuth2PasswordBearer
 from jose import JWTError, jwt
 from fastapi import HTTPException, Depends
 from src.app.core.config import SECRET_KEY, ALGORITHM
-from passlib.context import CryptContext
-from sqlalchemy.orm import Session
+from sqlalchemy import Row, String, literal_column, select, union_all, update
+from sqlalchemy.ext.asyncio import AsyncSession
 
-from src.app.core.hashing import verify_password
+from src.app.core.cache import LRUCache
+from src.app.core.hashing import hash_password, verify_and_update_password
+from src.app.core.metrics import Counter
 from src.app.models.admin import Admin
 from src.app.models.superadmin import SuperAdmin
 
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="security/token")
 
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+# Sized from Settings.token_cache_size when the app starts.
+token_cache = LRUCache(0)
+Counter("token_cache_hits_total", "Verified token cache hits.", function=lambda: token_cache.hits)
+Counter("token_cache_misses_total", "Verified token cache misses.", function=lambda: token_cache.misses)
+
+_dummy_password_hash: Optional[str] = None
 
 def create_access_token(data: dict, expires_delta: Optional[timedelta] = None):
     to_encode = data.copy()
@@ -23,9 +32,13 @@ def create_access_token(data: dict, expires_delta: Optional[timedelta] = None):
 
 
 def verify_token(token: str):
+    cache_key = hashlib.sha256(token.encode()).digest()
+    payload = token_cache.get(cache_key)
+    if payload is not None:
+        return payload
+
     try:
         payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
-        return payload
     except JWTError:
         raise HTTPException(
             status_code=401,
@@ -33,25 +46,21 @@ def verify_token(token: str):
             headers={"WWW-Authenticate": "Bearer"},
         )
 
+    if isinstance(payload.get("exp"), (int, float)):
+        token_cache.set(cache_key, payload, expires_at=payload["exp"])
+    return payload
+
 
 def verify_super_admin_token(token: str):
-    try:
-        payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
-        return payload
-    except JWTError:
-        raise HTTPException(
-            status_code=401,
-            detail="Invalid or expired token.",
-            headers={"WWW-Authenticate": "Bearer"},
-        )
+    return verify_token(token)
 
 
-def get_current_user(token: str = Depends(oauth2_scheme)):
+async def get_current_user(token: str = Depends(oauth2_scheme)):
     payload = verify_token(token)
     return payload
 
 
-def is_admin(current_user: dict = Depends(get_current_user)):
+async def is_admin(current_user: dict = Depends(get_current_user)):
     if current_user["role"] != "admin":
         raise HTTPException(
             status_code=403,
@@ -60,7 +69,7 @@ def is_admin(current_user: dict = Depends(get_current_user)):
     return current_user
 
 
-def is_super_admin(current_user: dict = Depends(get_current_user)):
+async def is_super_admin(current_user: dict = Depends(get_current_user)):
     if current_user["role"] != "super_admin":
         raise HTTPException(
             status_code=403,
@@ -69,7 +78,7 @@ def is_super_admin(current_user: dict = Depends(get_current_user)):
     return current_user
 
 
-def is_admin_or_super_admin(current_user: dict = Depends(get_current_user)):
+async def is_admin_or_super_admin(current_user: dict = Depends(get_current_user)):
     if current_user["role"] not in ["admin", "super_admin"]:
         raise HTTPException(
             status_code=403,
@@ -78,15 +87,43 @@ def is_admin_or_super_admin(current_user: dict = Depends(get_current_user)):
     return current_user
 
 
-def authenticate_admin(db: Session, username: str, password: str) -> Optional[Admin]:
-    admin = db.query(Admin).filter(Admin.username == username).first()
-    if admin and verify_password(password, admin.password):
-        return admin
-    return None
-
-
-def authenticate_super_admin(db: Session, username: str, password: str) -> Optional[SuperAdmin]:
-    super_admin = db.query(SuperAdmin).filter(SuperAdmin.username == username).first()
-    if super_admin and verify_password(password, super_admin.password):
-        return super_admin
-    return None
+def principals_named(username: str):
+    admin_role = literal_column("'admin'", String).label("role")
+    super_admin_role = literal_column("'super_admin'", String).label("role")
+    return union_all(
+        select(Admin.id, Admin.username, Admin.password, admin_role).where(Admin.username == username),
+        select(SuperAdmin.id, SuperAdmin.username, SuperAdmin.password, super_admin_role)
+        .where(SuperAdmin.username == username),
+    )
+
+
+async def get_principal(db: AsyncSession, username: str) -> Optional[Row]:
+    principals = principals_named(username)
+    # Admin usernames cannot shadow a super admin; should one predate that check, the super admin still wins.
+    result = await db.execute(principals.order_by(principals.selected_columns.role.desc()).limit(1))
+    return result.first()
+
+
+async def get_dummy_password_hash() -> str:
+    global _dummy_password_hash
+    if _dummy_password_hash is None:
+        _dummy_password_hash = await hash_password(secrets.token_urlsafe(32))
+    return _dummy_password_hash
+
+
+async def authenticate_principal(db: AsyncSession, username: str, password: str) -> Optional[Row]:
+    principal = await get_principal(db, username)
+    hashed_password = principal.password if principal else await get_dummy_password_hash()
+    password_is_valid, new_hash = await verify_and_update_password(password, hashed_password)
+    if not (principal and password_is_valid):
+        return None
+    if new_hash is not None:
+        model = SuperAdmin if principal.role == "super_admin" else Admin
+        await db.execute(
+            update(model)
+            .where(model.id == principal.id, model.password == principal.password)
+            .values(password=new_hash)
+            .execution_options(synchronize_session=False)
+        )
+        await db.commit()
+    return principal
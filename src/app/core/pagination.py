@@ -0,0 +1,67 @@
+import base64
+import binascii
+import json
+from typing import Any, Optional
+
+from fastapi import HTTPException, Query, status
+
+from src.app.core.config import get_settings
+
+
+def encode_cursor(last_id: int, sort: Optional[str] = None, value: Any = None) -> str:
+    payload = {"id": last_id}
+    if sort not in (None, "id"):
+        payload.update(sort=sort, value=value)
+    raw = json.dumps(payload, separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def page_limit(limit: Optional[int] = Query(None, ge=1)) -> int:
+    settings = get_settings()
+    if limit is None:
+        return settings.default_page_size
+    if limit > settings.max_page_size:
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+            detail=f"limit must be at most {settings.max_page_size}."
+        )
+    return limit
+
+
+def _invalid_cursor() -> HTTPException:
+    return HTTPException(
+        status_code=status.HTTP_400_BAD_REQUEST,
+        detail="Invalid cursor."
+    )
+
+
+def decode_cursor(cursor: Optional[str], sort: Optional[str] = None) -> Any:
+    if not cursor:
+        return None
+    if sort == "id":
+        sort = None
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        payload = json.loads(base64.urlsafe_b64decode(padded))
+        value = payload["id"] if sort is None else payload["value"]
+    except (binascii.Error, ValueError, KeyError, TypeError):
+        raise _invalid_cursor()
+    if sort is not None and payload.get("sort") != sort:
+        raise _invalid_cursor()
+    expected_type = int if sort is None or sort.lstrip("-") == "id" else str
+    if not isinstance(value, expected_type) or isinstance(value, bool):
+        raise _invalid_cursor()
+    return value
+
+
+def build_page(rows: list, limit: int, sort: Optional[str] = None) -> dict:
+    has_more = len(rows) > limit
+    items = rows[:limit]
+    next_cursor = None
+    if has_more:
+        last = items[-1]
+        next_cursor = encode_cursor(last.id, sort, getattr(last, sort.lstrip("-")) if sort else None)
+    return {
+        "items": items,
+        "next_cursor": next_cursor,
+    }
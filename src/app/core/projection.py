@@ -0,0 +1,32 @@
+from typing import Callable, Dict, List, Optional, Sequence
+
+from fastapi import HTTPException, status
+
+
+def parse_fields(fields: Optional[str], allowed: Sequence[str]) -> List[str]:
+    if not fields:
+        return list(allowed)
+    selected = list(dict.fromkeys(field.strip() for field in fields.split(",") if field.strip()))
+    unknown = [field for field in selected if field not in allowed]
+    if unknown or not selected:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Invalid fields: {', '.join(unknown) or fields}. Allowed fields: {', '.join(allowed)}."
+        )
+    return selected
+
+
+def select_columns(model, fields: Sequence[str], required: Sequence[str] = ("id",)) -> list:
+    return [getattr(model, name) for name in dict.fromkeys([*required, *fields])]
+
+
+def project_rows(rows: Sequence, fields: Sequence[str],
+                 converters: Optional[Dict[str, Callable]] = None) -> List[dict]:
+    if not rows:
+        return []
+    names = rows[0]._fields
+    getters = [(field, names.index(field), (converters or {}).get(field)) for field in fields]
+    return [
+        {field: convert(row[index]) if convert else row[index] for field, index, convert in getters}
+        for row in rows
+    ]
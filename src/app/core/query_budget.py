@@ -0,0 +1,53 @@
+import logging
+from functools import lru_cache
+from typing import Optional, Tuple
+
+from src.app.core.config import get_settings
+from src.app.core.metrics import Counter
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_QUERY_BUDGETS = {
+    "POST /clients/create-client": 3,
+    "POST /clients/bulk-create": 3,
+    "GET /clients/list-clients": 1,
+    "GET /clients/export": 1,
+    "GET /clients/stats": 1,
+    "GET /clients/changes": 0,
+    "GET /clients/changes/poll": 0,
+    "POST /clients/import": 3,
+    "GET /clients/import/{job_id}": 1,
+    "GET /clients/import/{job_id}/rejected": 1,
+    "POST /clients/batch-get": 1,
+    "POST /clients/bulk-status": 3,
+    "GET /clients/{client_id}": 1,
+    "PUT /clients/{client_id}": 3,
+    "DELETE /clients/{client_id}": 2,
+    "GET /admins/list-admins": 1,
+    "GET /admins/{admin_id}": 1,
+    "PUT /admins/{admin_id}": 1,
+    "DELETE /admins/{admin_id}": 1,
+    "POST /security/token": 2,
+    "POST /security/create-admin": 5,
+    "GET /health/ready": 1,
+}
+
+query_budget_exceeded = Counter("db_query_budget_exceeded_total", "Requests that ran more SQL than their budget.",
+                                ("method", "route"))
+
+
+@lru_cache(maxsize=8)
+def _query_budgets(overrides: Tuple[Tuple[str, int], ...]) -> dict:
+    return {**DEFAULT_QUERY_BUDGETS, **dict(overrides)}
+
+
+def get_query_budget(method: str, route: str) -> Optional[int]:
+    settings = get_settings()
+    return _query_budgets(settings.query_budgets).get(f"{method} {route}", settings.query_budget_default)
+
+
+def check_query_budget(method: str, route: str, queries: int) -> None:
+    budget = get_query_budget(method, route)
+    if budget is not None and queries > budget:
+        query_budget_exceeded.labels(method, route).inc()
+        logger.warning("%s %s ran %d SQL statements (budget: %d).", method, route, queries, budget)
@@ -0,0 +1,42 @@
+import csv
+import io
+import zlib
+from typing import AsyncIterable, AsyncIterator, List, Optional
+
+from src.app.core.serialization import dumps
+
+
+async def ndjson_chunks(partitions: AsyncIterable[List[dict]]) -> AsyncIterator[bytes]:
+    async for rows in partitions:
+        yield b"".join(dumps(row) + b"\n" for row in rows)
+
+
+async def csv_chunks(partitions: AsyncIterable[List[dict]], fieldnames: List[str]) -> AsyncIterator[bytes]:
+    buffer = io.StringIO()
+    writer = csv.DictWriter(buffer, fieldnames=fieldnames)
+    writer.writeheader()
+    async for rows in partitions:
+        writer.writerows(rows)
+        yield buffer.getvalue().encode()
+        buffer.seek(0)
+        buffer.truncate()
+
+
+async def gzip_chunks(chunks: AsyncIterable[bytes]) -> AsyncIterator[bytes]:
+    compressor = zlib.compressobj(wbits=zlib.MAX_WBITS | 16)
+    async for chunk in chunks:
+        yield compressor.compress(chunk) + compressor.flush(zlib.Z_SYNC_FLUSH)
+    yield compressor.flush()
+
+
+def sse_event(data: dict, event: Optional[str] = None, event_id: Optional[str] = None) -> bytes:
+    lines = []
+    if event_id is not None:
+        lines.append(f"id: {event_id}".encode())
+    if event is not None:
+        lines.append(f"event: {event}".encode())
+    lines.append(b"data: " + dumps(data))
+    return b"\n".join(lines) + b"\n\n"
+
+
+SSE_KEEP_ALIVE = b": keep-alive\n\n"
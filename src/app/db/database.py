@@ -1,14 +1,129 @@
-from sqlalchemy import create_engine
-from sqlalchemy.ext.declarative import declarative_base
-from sqlalchemy.orm import sessionmaker
-from src.app.core.config import DB_USER, DB_PASSWORD, DB_NAME, DB_HOST, DB_PORT
+import itertools
+import time
+from typing import List, Optional
 
-SQLALCHEMY_DATABASE_URL = (
-    f"postgresql+pg8000://{DB_USER}:{DB_PASSWORD}@{DB_HOST}:{DB_PORT}/{DB_NAME}"
-)
+from sqlalchemy import text
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import AsyncEngine, async_sessionmaker, create_async_engine
+from sqlalchemy.ext.declarative import declarative_base
+from src.app.core.config import Settings, get_settings
+from src.app.core.instrumentation import instrument_engine
+from src.app.core.metrics import Counter, Gauge, Histogram
 
-engine = create_engine(SQLALCHEMY_DATABASE_URL, connect_args={"timeout": 30})
+_engine: Optional[AsyncEngine] = None
+_replicas: Optional["ReplicaSet"] = None
 
-SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+SessionLocal = async_sessionmaker(autoflush=False, expire_on_commit=False)
 
 Base = declarative_base()
+
+
+class ReplicaSet:
+    def __init__(self, engines: List[AsyncEngine], retry_after: float):
+        self.engines = engines
+        self.retry_after = retry_after
+        self._unhealthy_until = {}
+        self._offsets = itertools.cycle(range(len(engines)))
+
+    def candidates(self) -> List[AsyncEngine]:
+        if not self.engines:
+            return []
+        offset = next(self._offsets)
+        now = time.monotonic()
+        ordered = self.engines[offset:] + self.engines[:offset]
+        return [engine for engine in ordered if self._unhealthy_until.get(engine, 0) <= now]
+
+    def mark_unhealthy(self, engine: AsyncEngine) -> None:
+        self._unhealthy_until[engine] = time.monotonic() + self.retry_after
+        replica_failures.inc()
+
+
+def pool_options(settings: Settings, url: Optional[str] = None) -> dict:
+    options = {"pool_pre_ping": settings.db_pool_pre_ping, "pool_recycle": settings.db_pool_recycle}
+    if make_url(url or settings.sqlalchemy_database_url).get_backend_name() == "sqlite":
+        return options
+    options.update(pool_size=settings.db_pool_size, max_overflow=settings.db_max_overflow,
+                   pool_timeout=settings.db_pool_timeout)
+    return options
+
+
+def _create_engine(settings: Settings, url: str) -> AsyncEngine:
+    engine = create_async_engine(url, connect_args={"timeout": 30}, **pool_options(settings, url))
+    instrument_engine(engine.sync_engine)
+    return engine
+
+
+def init_engine(settings: Optional[Settings] = None) -> AsyncEngine:
+    global _engine, _replicas
+    if _engine is None:
+        settings = settings or get_settings()
+        _engine = _create_engine(settings, settings.sqlalchemy_database_url)
+        _replicas = ReplicaSet([_create_engine(settings, url) for url in settings.database_replica_urls],
+                               settings.replica_retry_after)
+        SessionLocal.configure(bind=_engine)
+    return _engine
+
+
+async def connection_limit(engine: AsyncEngine) -> Optional[int]:
+    if engine.dialect.name != "postgresql":
+        return None
+    async with engine.connect() as connection:
+        max_connections = int(await connection.scalar(text("SHOW max_connections")))
+        reserved = int(await connection.scalar(text("SHOW superuser_reserved_connections")))
+    return max_connections - reserved
+
+
+def get_engine() -> AsyncEngine:
+    if _engine is None:
+        raise RuntimeError("Database engine is not initialized. Call init_engine() first.")
+    return _engine
+
+
+def get_replicas() -> ReplicaSet:
+    return _replicas if _replicas is not None else ReplicaSet([], 0)
+
+
+def is_replica_session(db) -> bool:
+    return db.bind in get_replicas().engines
+
+
+async def dispose_engine() -> None:
+    global _engine, _replicas
+    if _engine is not None:
+        await _engine.dispose()
+        for replica in get_replicas().engines:
+            await replica.dispose()
+        _engine = None
+        _replicas = None
+        SessionLocal.configure(bind=None)
+
+
+def _pool_stat(name: str) -> int:
+    pool = _engine.pool if _engine is not None else None
+    return max(getattr(pool, name)(), 0) if hasattr(pool, name) else 0
+
+
+pool_checkout_seconds = Histogram("db_pool_checkout_seconds", "Time spent waiting for a pooled connection.")
+pool_checkout_timeouts = Counter("db_pool_checkout_timeouts_total", "Checkouts that hit the pool timeout.")
+replica_failures = Counter("db_replica_failures_total", "Replica connection failures that fell back to the primary.")
+Gauge("db_pool_checked_out", "Connections currently checked out.", function=lambda: _pool_stat("checkedout"))
+Gauge("db_pool_overflow", "Connections opened above the pool size.", function=lambda: _pool_stat("overflow"))
+
+
+def pool_status() -> dict:
+    pool = get_engine().pool
+    status = {"pool": type(pool).__name__}
+    if hasattr(pool, "checkedout"):
+        status.update(
+            size=pool.size(),
+            checked_in=pool.checkedin(),
+            checked_out=pool.checkedout(),
+            overflow=pool.overflow(),
+            max_overflow=pool._max_overflow,
+            timeout=pool.timeout(),
+        )
+    status.update(
+        checkout_seconds=pool_checkout_seconds.snapshot(),
+        checkout_timeouts=pool_checkout_timeouts.value,
+    )
+    return status
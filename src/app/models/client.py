@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, Enum as SQLAlchemyEnum
+from sqlalchemy import DDL, Column, Index, Integer, Sequence, String, Enum as SQLAlchemyEnum, event, func
 from src.app.db.database import Base
 from enum import Enum
 
@@ -20,3 +20,25 @@ class Client(Base):
     username = Column(String(20), unique=True, nullable=False)
     phone = Column(String(15), nullable=False)
     status = Column(SQLAlchemyEnum(Status), nullable=False, default=Status.ACTIVE)
+
+    __table_args__ = (
+        Index("ix_clients_status_id", "status", "id"),
+        Index("ix_clients_username_lower", func.lower(username).label("username_lower"),
+              postgresql_ops={"username_lower": "text_pattern_ops"}),
+        Index("ix_clients_email_lower", func.lower(email).label("email_lower"),
+              postgresql_ops={"email_lower": "text_pattern_ops"}),
+        Index("ix_clients_username_trgm", func.lower(username).label("username_lower"),
+              postgresql_using="gin", postgresql_ops={"username_lower": "gin_trgm_ops"}).ddl_if(dialect="postgresql"),
+        Index("ix_clients_email_trgm", func.lower(email).label("email_lower"),
+              postgresql_using="gin", postgresql_ops={"email_lower": "gin_trgm_ops"}).ddl_if(dialect="postgresql"),
+    )
+
+
+event.listen(
+    Client.__table__,
+    "before_create",
+    DDL("CREATE EXTENSION IF NOT EXISTS pg_trgm").execute_if(dialect="postgresql"),
+)
+
+# Numbers the change-feed events published with NOTIFY, so every worker issues the same cursors.
+client_change_sequence = Sequence("client_change_seq", metadata=Base.metadata)
@@ -0,0 +1,17 @@
+from sqlalchemy import Column, Float, Integer, String, Text
+
+from src.app.db.database import Base
+
+
+class ClientImportJob(Base):
+    __tablename__ = 'client_import_jobs'
+
+    id = Column(String(32), primary_key=True)
+    status = Column(String(16), nullable=False, default="queued")
+    processed = Column(Integer, nullable=False, default=0)
+    created = Column(Integer, nullable=False, default=0)
+    rejected = Column(Integer, nullable=False, default=0)
+    error = Column(Text, nullable=True)
+    submitted_at = Column(Float, nullable=False, index=True)
+    started_at = Column(Float, nullable=True)
+    finished_at = Column(Float, nullable=True)
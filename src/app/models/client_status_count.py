@@ -0,0 +1,21 @@
+from sqlalchemy import Column, Integer, event, insert
+
+from src.app.core.config import get_settings
+from src.app.db.database import Base
+from src.app.models.client import Client, Status
+
+
+class ClientStatusCount(Base):
+    __tablename__ = 'client_status_counts'
+
+    status = Column(Client.__table__.c.status.type, primary_key=True)
+    shard = Column(Integer, primary_key=True, default=0)
+    count = Column(Integer, nullable=False, default=0)
+
+
+@event.listens_for(ClientStatusCount.__table__, "after_create")
+def seed_status_counts(target, connection, **kwargs):
+    connection.execute(insert(target), [
+        {"status": status, "shard": shard, "count": 0}
+        for status in Status for shard in range(get_settings().client_status_count_shards)
+    ])
@@ -0,0 +1,14 @@
+from sqlalchemy import Column, Float, Integer, LargeBinary, String, Text
+
+from src.app.db.database import Base
+
+
+class IdempotencyKey(Base):
+    __tablename__ = 'idempotency_keys'
+
+    key = Column(String(64), primary_key=True)
+    fingerprint = Column(String(64), nullable=False)
+    status_code = Column(Integer, nullable=True)
+    headers = Column(Text, nullable=True)
+    body = Column(LargeBinary, nullable=True)
+    expires_at = Column(Float, nullable=False, index=True)
@@ -0,0 +1,62 @@
+import asyncio
+import os
+from typing import Optional
+
+import uvicorn
+from sqlalchemy.exc import SQLAlchemyError
+
+from src.app.core.config import Settings, get_settings
+from src.app.core.hashing import shutdown_hashing_executor
+from src.app.db.database import connection_limit, dispose_engine, init_engine
+from src.app.services.client_cache import check_client_cache
+
+
+def worker_count(settings: Settings) -> int:
+    return settings.web_concurrency or os.cpu_count() or 1
+
+
+async def prepare_database(settings: Settings) -> Optional[int]:
+    from main import bootstrap_database
+
+    try:
+        if settings.schema_bootstrap != "none":
+            await bootstrap_database(settings)
+        if settings.db_max_connections is not None:
+            return settings.db_max_connections
+        try:
+            return await connection_limit(init_engine(settings))
+        except (OSError, SQLAlchemyError):
+            return None
+    finally:
+        await dispose_engine()
+        # Creating the super admin hashes its password; the pool must not outlive the bootstrap.
+        shutdown_hashing_executor()
+
+
+def run(settings: Optional[Settings] = None) -> None:
+    settings = settings or get_settings()
+    workers = worker_count(settings)
+    check_client_cache(settings, workers)
+
+    # Workers rebuild their settings from the environment: they need the resolved worker count and the server's
+    # connection limit to size their share of the connection and hashing pools, and must not each repeat the
+    # schema bootstrap done here.
+    max_connections = asyncio.run(prepare_database(settings))
+    os.environ.update(WEB_CONCURRENCY=str(workers), SCHEMA_BOOTSTRAP="none")
+    if max_connections is not None:
+        os.environ["DB_MAX_CONNECTIONS"] = str(max_connections)
+
+    uvicorn.run(
+        "main:app",
+        host=settings.app_host,
+        port=settings.app_port,
+        workers=workers,
+        loop=settings.server_loop,
+        http=settings.server_http,
+        timeout_graceful_shutdown=settings.graceful_timeout,
+        proxy_headers=True,
+    )
+
+
+if __name__ == "__main__":
+    run()
@@ -1,66 +1,69 @@
-from fastapi import HTTPException
-from sqlalchemy.orm import Session
-from starlette import status
+from typing import Optional, Sequence
 
-from src.app.core.exceptions import NotFound
-from src.app.models.admin import Admin
-
-class AdminService:
-
-    @staticmethod
-    def validate_admin_data(admin_data: dict, admin_id: int, db: Session):
-        validation_errors = []
-
-        admin_with_email_in_db = db.query(Admin).filter(Admin.email == admin_data["email"]).first()
+from fastapi import HTTPException, status
+from sqlalchemy import Row, delete, exists, select, update
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
 
-        if  admin_with_email_in_db and  admin_with_email_in_db.id != admin_id:
-            validation_errors.append("Email already registered.")
-
-        admin_with_username_in_db = db.query(Admin).filter(Admin.username == admin_data["username"]).first()
+from src.app.core.exceptions import NotFound, describe_unique_violation
+from src.app.core.projection import select_columns
+from src.app.models.admin import Admin
+from src.app.models.superadmin import SuperAdmin
 
-        if admin_with_username_in_db and admin_with_username_in_db.id != admin_id:
-            validation_errors.append("Username already taken.")
+ADMIN_FIELDS = ["id", "username", "email"]
 
-        if validation_errors:
-            raise HTTPException(
-                status_code=status.HTTP_400_BAD_REQUEST,
-                detail="; ".join(validation_errors)
-            )
+class AdminService:
 
     @staticmethod
-    def get_all_admins(db: Session) -> list[Admin]:
-        admins = db.query(Admin).all()
-        if not admins:
+    async def get_all_admins(db: AsyncSession, limit: int, after_id: Optional[int] = None,
+                             fields: Sequence[str] = ADMIN_FIELDS) -> list[Row]:
+        query = select(*select_columns(Admin, fields))
+        if after_id is not None:
+            query = query.filter(Admin.id > after_id)
+        admins = (await db.execute(query.order_by(Admin.id).limit(limit))).all()
+        if not admins and after_id is None:
             raise NotFound("No admins found.")
         return admins
 
     @staticmethod
-    def get_admin_by_id(db: Session, admin_id: int) -> Admin:
-        admin = db.query(Admin).filter(Admin.id == admin_id).first()
+    async def get_admin_by_id(db: AsyncSession, admin_id: int) -> Admin:
+        admin = await db.get(Admin, admin_id)
         if not admin:
             raise NotFound("Admin not found.")
         return admin
 
     @staticmethod
-    def update_admin_by_id(db: Session, admin_id: int, admin_data: dict) -> Admin:
-        admin = db.query(Admin).get(admin_id)
-        if not admin:
-            raise NotFound("Admin not found.")
+    async def update_admin_by_id(db: AsyncSession, admin_id: int, admin_data: dict) -> Row:
+        try:
+            admin = (await db.execute(
+                update(Admin)
+                .where(Admin.id == admin_id, ~exists().where(SuperAdmin.username == admin_data["username"]))
+                .values(**admin_data)
+                .returning(Admin.id, Admin.username, Admin.email)
+                .execution_options(synchronize_session=False)
+            )).first()
+            await db.commit()
+        except IntegrityError as e:
+            await db.rollback()
+            raise await describe_unique_violation(db, Admin, admin_id, admin_data, e)
 
-        AdminService.validate_admin_data(admin_data, admin_id, db)
-
-        for key, value in admin_data.items():
-            setattr(admin, key, value)
-
-        db.commit()
-        db.refresh(admin)
+        if not admin:
+            if await db.get(Admin, admin_id) is None:
+                raise NotFound("Admin not found.")
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Username already taken."
+            )
         return admin
 
     @staticmethod
-    def delete_admin_by_id(db: Session, admin_id: int) -> None:
-        admin = db.query(Admin).get(admin_id)
-        if not admin:
+    async def delete_admin_by_id(db: AsyncSession, admin_id: int) -> None:
+        deleted_id = await db.scalar(
+            delete(Admin)
+            .where(Admin.id == admin_id)
+            .returning(Admin.id)
+            .execution_options(synchronize_session=False)
+        )
+        await db.commit()
+        if deleted_id is None:
             raise NotFound("Admin not found.")
-
-        db.delete(admin)
-        db.commit()
\ No newline at end of file
@@ -1,40 +1,134 @@
-from typing import Optional
+import random
+from collections import Counter
+from operator import attrgetter
+from typing import Any, AsyncIterator, Dict, Optional, Sequence
 
 from fastapi.security import OAuth2PasswordBearer
-from sqlalchemy import and_, or_
-from sqlalchemy.orm import Session
-from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy import ColumnElement, Row, and_, case, delete, func, insert, or_, select, update
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.exc import IntegrityError, SQLAlchemyError
 from fastapi import HTTPException, status
 
-from src.app.core.exceptions import NotFound
+from src.app.core.config import get_settings
+from src.app.core.exceptions import NotFound, describe_unique_violation, unique_violation
+from src.app.core.projection import project_rows, select_columns
+from src.app.db.database import is_replica_session
 from src.app.models.client import Client, Status
+from src.app.models.client_status_count import ClientStatusCount
+from src.app.services.client_cache import get_client_cache
+from src.app.services.client_changes import record_client_changes
 
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="security/token")
 
+CLIENT_FIELDS = ["id", "username", "email", "phone", "status"]
+CLIENT_COLUMNS = (Client.id, Client.username, Client.email, Client.phone, Client.status)
+CLIENT_FIELD_CONVERTERS = {"status": attrgetter("value")}
+
+
+def client_row_to_dict(row) -> dict:
+    return {"id": row.id, "username": row.username, "email": row.email,
+            "phone": row.phone, "status": row.status.value}
+
+
+def client_rows_to_dicts(rows, fields: Sequence[str] = CLIENT_FIELDS) -> list[dict]:
+    return project_rows(rows, fields, CLIENT_FIELD_CONVERTERS)
+
+
+async def adjust_status_counts(db: AsyncSession, deltas: Dict[Status, int]) -> None:
+    deltas = {client_status: delta for client_status, delta in deltas.items() if delta}
+    if not deltas:
+        return
+    # Each write lands on a random shard, so concurrent writers rarely wait on the same counter row. The upsert
+    # creates a shard row that does not exist yet (e.g. after CLIENT_STATUS_COUNT_SHARDS was raised).
+    shard = random.randrange(get_settings().client_status_count_shards)
+    dialect_insert = postgresql.insert if db.get_bind().dialect.name == "postgresql" else sqlite.insert
+    upsert = dialect_insert(ClientStatusCount).values([
+        {"status": client_status, "shard": shard, "count": deltas[client_status]}
+        for client_status in sorted(deltas, key=attrgetter("value"))
+    ])
+    await db.execute(upsert.on_conflict_do_update(
+        index_elements=[ClientStatusCount.status, ClientStatusCount.shard],
+        set_={"count": ClientStatusCount.count + upsert.excluded.count},
+    ))
+
+
+async def update_clients_returning_previous_status(db: AsyncSession, where: Sequence[ColumnElement], values: dict,
+                                                   limit: Optional[int] = None) -> list[tuple[Row, Status]]:
+    selected = select(Client.id, Client.status).where(*where)
+    if limit is not None:
+        selected = selected.order_by(Client.id).limit(limit)
+    if db.get_bind().dialect.name == "postgresql":
+        previous = selected.with_for_update().subquery()
+        rows = (await db.execute(
+            update(Client)
+            .where(Client.id == previous.c.id)
+            .values(**values)
+            .returning(*CLIENT_COLUMNS, previous.c.status.label("previous_status"))
+            .execution_options(synchronize_session=False)
+        )).all()
+        return [(row, row.previous_status) for row in rows]
+
+    # SQLite can't return columns of the FROM clause; it runs one writer at a time, so reading first is safe.
+    previous = dict((await db.execute(selected)).all())
+    if not previous:
+        return []
+    rows = (await db.execute(
+        update(Client)
+        .where(Client.id.in_(previous))
+        .values(**values)
+        .returning(*CLIENT_COLUMNS)
+        .execution_options(synchronize_session=False)
+    )).all()
+    return [(row, previous[row.id]) for row in rows]
+
+
+
+async def insert_clients(db: AsyncSession, clients_data: list[dict]) -> list:
+    # One entry per row: the created row, or the reason the database refused it.
+    try:
+        created = (await db.execute(insert(Client).returning(*CLIENT_COLUMNS), clients_data)).all()
+        await adjust_status_counts(db, Counter(row.status for row in created))
+        record_client_changes(db, "created", [client_row_to_dict(row) for row in created])
+        await db.commit()
+    except SQLAlchemyError as e:
+        await db.rollback()
+        if len(clients_data) == 1:
+            if isinstance(e, IntegrityError):
+                return [unique_violation(e).detail]
+            return [f"Error creating client: {str(e)}"]
+        # A row inserted concurrently (or otherwise refused) fails the whole INSERT; split until only it is left.
+        middle = len(clients_data) // 2
+        return await insert_clients(db, clients_data[:middle]) + await insert_clients(db, clients_data[middle:])
+
+    created_by_username = {row.username: row for row in created}
+    return [created_by_username[client_data["username"]] for client_data in clients_data]
 
 class ClientService:
     @staticmethod
-    def validate_client_data(client_data: dict, client_id: Optional[id], db: Session):
+    async def validate_client_data(client_data: dict, client_id: Optional[id], db: AsyncSession):
         validation_errors = []
 
         if client_id is None:
-            client_to_create = db.query(Client).filter(
+            client_to_create = await db.scalar(select(Client).filter(
                 or_(
                     Client.username == client_data['username'],
                     Client.email == client_data['email']
                 )
-            ).first()
+            ).limit(1))
 
             if client_to_create is not None:
                 validation_errors.append("User with this credentials already registered.")
 
         else:
-            client_with_email_in_db = db.query(Client).filter(Client.email == client_data["email"]).first()
+            client_with_email_in_db = await db.scalar(select(Client).filter(Client.email == client_data["email"]))
 
             if client_with_email_in_db and client_with_email_in_db.id != client_id:
                 validation_errors.append("Email already registered.")
 
-            client_with_username_in_db = db.query(Client).filter(Client.username == client_data["username"]).first()
+            client_with_username_in_db = await db.scalar(
+                select(Client).filter(Client.username == client_data["username"])
+            )
 
             if client_with_username_in_db and client_with_username_in_db.id != client_id:
                 validation_errors.append("Username already taken.")
@@ -46,56 +140,236 @@ class ClientService:
             )
 
     @staticmethod
-    def create_client(db: Session, client_data: dict) -> Client:
-        ClientService.validate_client_data(client_data, None, db)
+    async def create_client(db: AsyncSession, client_data: dict) -> Client:
+        await ClientService.validate_client_data(client_data, None, db)
         try:
             new_client = Client(**client_data)
             db.add(new_client)
-            db.commit()
-            db.refresh(new_client)
+            await db.flush()
+            await adjust_status_counts(db, {new_client.status: 1})
+            record_client_changes(db, "created", [client_row_to_dict(new_client)])
+            await db.commit()
             return new_client
         except SQLAlchemyError as e:
-            db.rollback()
+            await db.rollback()
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
                 detail=f"Error creating client: {str(e)}"
             )
 
     @staticmethod
-    def get_all_clients(db: Session) -> list[Client]:
-        clients = db.query(Client).all()
-        if not clients:
+    async def bulk_create_clients(db: AsyncSession, clients_data: list[dict]) -> list[dict]:
+        if not clients_data:
+            return []
+
+        usernames = {client_data["username"] for client_data in clients_data}
+        emails = {client_data["email"] for client_data in clients_data}
+        registered = (await db.execute(
+            select(Client.username, Client.email).where(
+                or_(Client.username.in_(usernames), Client.email.in_(emails))
+            )
+        )).all()
+        registered_usernames = {row.username for row in registered}
+        registered_emails = {row.email for row in registered}
+
+        results = []
+        rows_to_insert = []
+        batch_usernames = set()
+        batch_emails = set()
+        for index, client_data in enumerate(clients_data):
+            validation_errors = []
+            if client_data["email"] in registered_emails:
+                validation_errors.append("Email already registered.")
+            elif client_data["email"] in batch_emails:
+                validation_errors.append("Email duplicated in batch.")
+            if client_data["username"] in registered_usernames:
+                validation_errors.append("Username already taken.")
+            elif client_data["username"] in batch_usernames:
+                validation_errors.append("Username duplicated in batch.")
+
+            if validation_errors:
+                results.append({"index": index, "status": "rejected", "detail": "; ".join(validation_errors)})
+                continue
+
+            batch_usernames.add(client_data["username"])
+            batch_emails.add(client_data["email"])
+            results.append({"index": index, "status": "created"})
+            rows_to_insert.append(client_data)
+
+        if rows_to_insert:
+            outcomes = iter(await insert_clients(db, rows_to_insert))
+            for result in results:
+                if result["status"] == "created":
+                    outcome = next(outcomes)
+                    if isinstance(outcome, str):
+                        result.update(status="rejected", detail=outcome)
+                    else:
+                        result["client"] = client_row_to_dict(outcome)
+
+        return results
+
+    @staticmethod
+    async def get_all_clients(db: AsyncSession, limit: int, after: Any = None,
+                              fields: Sequence[str] = CLIENT_FIELDS, client_status: Optional[Status] = None,
+                              search: Optional[str] = None, match: str = "prefix", sort: str = "id") -> list[Row]:
+        sort_column = getattr(Client, sort.lstrip("-"))
+        descending = sort.startswith("-")
+        query = select(*select_columns(Client, fields, ("id", sort_column.key)))
+        if client_status is not None:
+            query = query.filter(Client.status == client_status)
+        if search:
+            pattern = search.lower().replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+            pattern = f"{pattern}%" if match == "prefix" else f"%{pattern}%"
+            query = query.filter(or_(
+                func.lower(Client.username).like(pattern, escape="\\"),
+                func.lower(Client.email).like(pattern, escape="\\"),
+            ))
+        if after is not None:
+            query = query.filter(sort_column < after if descending else sort_column > after)
+        query = query.order_by(sort_column.desc() if descending else sort_column)
+        clients = (await db.execute(query.limit(limit))).all()
+        if not clients and after is None and client_status is None and not search:
             raise NotFound("No clients found.")
         return clients
 
     @staticmethod
-    def get_client_by_id(db: Session, client_id: int) -> Client:
-        client = db.query(Client).filter(Client.id == client_id).first()
+    async def iter_clients(db: AsyncSession, chunk_size: int,
+                           fields: Sequence[str] = CLIENT_FIELDS) -> AsyncIterator[list[dict]]:
+        result = await db.stream(
+            select(*select_columns(Client, fields))
+            .order_by(Client.id)
+            .execution_options(yield_per=chunk_size)
+        )
+        async for rows in result.partitions():
+            yield client_rows_to_dicts(rows, fields)
+
+    @staticmethod
+    async def get_clients_by_ids(db: AsyncSession, client_ids: Sequence[int]) -> tuple[list[dict], list[int]]:
+        rows = (await db.execute(select(*CLIENT_COLUMNS).where(Client.id.in_(client_ids)))).all()
+        found = {row.id: row for row in rows}
+        clients = client_rows_to_dicts([found[client_id] for client_id in client_ids if client_id in found])
+        missing = [client_id for client_id in client_ids if client_id not in found]
+        return clients, missing
+
+    @staticmethod
+    async def get_client_by_id(db: AsyncSession, client_id: int) -> Client:
+        client = await db.get(Client, client_id)
         if not client:
             raise NotFound("Client not found.")
         return client
 
     @staticmethod
-    def update_client_by_id(db: Session, client_id: int, client_data: dict) -> Client:
-        client = db.query(Client).get(client_id)
-
-        if not client:
-            raise NotFound("Client not found")
+    async def get_client_data_by_id(db: AsyncSession, client_id: int) -> dict:
+        async def load() -> dict:
+            return client_row_to_dict(await ClientService.get_client_by_id(db, client_id))
 
-        ClientService.validate_client_data(client_data, client_id, db)
+        client_cache = get_client_cache()
+        if client_cache is None:
+            return await load()
+        if is_replica_session(db):
+            # A lagging replica can still return the row a write just invalidated, so it never fills the cache.
+            cached = await client_cache.get(client_id)
+            return cached if cached is not None else await load()
+        return await client_cache.get_or_load(client_id, load)
 
-        for key, value in client_data.items():
-            setattr(client, key, value)
+    @staticmethod
+    async def update_client_by_id(db: AsyncSession, client_id: int, client_data: dict) -> Row:
+        try:
+            updated = await update_clients_returning_previous_status(db, [Client.id == client_id], client_data)
+            if not updated:
+                await db.rollback()
+                raise NotFound("Client not found")
+            client, previous_status = updated[0]
+            if client.status != previous_status:
+                await adjust_status_counts(db, {previous_status: -1, client.status: 1})
+            record_client_changes(db, "updated", [client_row_to_dict(client)])
+            await db.commit()
+        except IntegrityError as e:
+            await db.rollback()
+            raise await describe_unique_violation(db, Client, client_id, client_data, e)
 
-        db.commit()
-        db.refresh(client)
+        client_cache = get_client_cache()
+        if client_cache is not None:
+            await client_cache.invalidate(client_id)
         return client
 
     @staticmethod
-    def delete_client_by_id(db: Session, client_id: int) -> None:
-        client = db.query(Client).get(client_id)
-        if not client:
+    async def update_clients_status(db: AsyncSession, new_status: Status, client_ids: Optional[Sequence[int]] = None,
+                                    current_status: Optional[Status] = None, limit: Optional[int] = None) -> list[int]:
+        where = [Client.status != new_status]
+        if current_status is not None:
+            where.append(Client.status == current_status)
+        if client_ids is not None:
+            where.append(Client.id.in_(client_ids))
+
+        updated_with_previous = await update_clients_returning_previous_status(
+            db, where, {"status": new_status}, limit
+        )
+        updated = [row for row, _ in updated_with_previous]
+        previous_counts = Counter(previous_status for _, previous_status in updated_with_previous)
+
+        deltas = {previous_status: -count for previous_status, count in previous_counts.items()}
+        deltas[new_status] = len(updated)
+        await adjust_status_counts(db, deltas)
+        record_client_changes(db, "updated", [client_row_to_dict(row) for row in updated])
+        await db.commit()
+
+        updated_ids = [row.id for row in updated]
+        client_cache = get_client_cache()
+        if client_cache is not None:
+            await client_cache.invalidate_many(updated_ids)
+        return updated_ids
+
+    @staticmethod
+    async def get_status_counts(db: AsyncSession) -> dict:
+        counts = {client_status.value: 0 for client_status in Status}
+        for row in await db.execute(
+            select(ClientStatusCount.status, func.sum(ClientStatusCount.count).label("count"))
+            .group_by(ClientStatusCount.status)
+        ):
+            counts[row.status.value] = row.count
+        return {**counts, "total": sum(counts.values())}
+
+    @staticmethod
+    async def reconcile_status_counts(db: AsyncSession) -> dict:
+        # Holding the counter rows blocks concurrent writers until the recount is stored, so none of their
+        # increments can land between the GROUP BY and the overwrite.
+        stored = set((await db.execute(
+            select(ClientStatusCount.status, ClientStatusCount.shard).with_for_update()
+        )).all())
+        actual = dict((await db.execute(select(Client.status, func.count()).group_by(Client.status))).all())
+        whens = [(ClientStatusCount.status == client_status, count) for client_status, count in actual.items()]
+        await db.execute(
+            update(ClientStatusCount)
+            .values(count=case((ClientStatusCount.shard == 0, case(*whens, else_=0)), else_=0) if whens else 0)
+            .execution_options(synchronize_session=False)
+        )
+        shards = range(get_settings().client_status_count_shards)
+        missing = [(client_status, shard) for client_status in Status for shard in shards
+                   if (client_status, shard) not in stored]
+        if missing:
+            await db.execute(insert(ClientStatusCount), [
+                {"status": client_status, "shard": shard, "count": actual.get(client_status, 0) if shard == 0 else 0}
+                for client_status, shard in missing
+            ])
+        await db.commit()
+        return await ClientService.get_status_counts(db)
+
+    @staticmethod
+    async def delete_client_by_id(db: AsyncSession, client_id: int) -> None:
+        deleted_status = await db.scalar(
+            delete(Client)
+            .where(Client.id == client_id)
+            .returning(Client.status)
+            .execution_options(synchronize_session=False)
+        )
+        if deleted_status is None:
+            await db.rollback()
             raise NotFound("Client not found.")
+        await adjust_status_counts(db, {deleted_status: -1})
+        record_client_changes(db, "deleted", [{"id": client_id}])
+        await db.commit()
 
-        db.delete(client)
-        db.commit()
+        client_cache = get_client_cache()
+        if client_cache is not None:
+            await client_cache.invalidate(client_id)
@@ -0,0 +1,105 @@
+import asyncio
+from typing import Any, Awaitable, Callable, Iterable, List, Optional
+
+from src.app.core.cache import CacheBackend, InMemoryCacheBackend, SingleFlight
+from src.app.core.config import Settings
+from src.app.services.client_changes import client_changes
+
+
+class ClientCache:
+    def __init__(self, backend: CacheBackend, ttl: float):
+        self.backend = backend
+        self.ttl = ttl
+        self._loads = SingleFlight()
+        self._generation = 0
+        self._pending: set[asyncio.Task] = set()
+
+    @staticmethod
+    def _key(client_id: int) -> str:
+        return f"client:{client_id}"
+
+    async def get(self, client_id: int) -> Optional[dict]:
+        return await self.backend.get(self._key(client_id))
+
+    async def get_or_load(self, client_id: int, loader: Callable[[], Awaitable[dict]]) -> dict:
+        key = self._key(client_id)
+        cached = await self.backend.get(key)
+        if cached is not None:
+            return cached
+
+        async def load() -> dict:
+            generation = self._generation
+            client = await loader()
+            # A write that landed while we were reading may have produced a newer row.
+            if generation == self._generation:
+                await self.backend.set(key, client, self.ttl)
+            return client
+
+        return await self._loads.do(key, load)
+
+    async def invalidate(self, client_id: int) -> None:
+        key = self._key(client_id)
+        self._generation += 1
+        self._loads.forget(key)
+        await self.backend.delete(key)
+
+    async def invalidate_many(self, client_ids: Iterable[int]) -> None:
+        for client_id in client_ids:
+            await self.invalidate(client_id)
+
+    def _schedule(self, operation: Awaitable[None]) -> None:
+        task = asyncio.ensure_future(operation)
+        self._pending.add(task)
+        task.add_done_callback(self._pending.discard)
+
+    def discard(self, client_ids: Iterable[int]) -> None:
+        # Change-feed subscribers run synchronously; the generation bump stops in-flight loads right away.
+        self._generation += 1
+        for client_id in client_ids:
+            key = self._key(client_id)
+            self._loads.forget(key)
+            self._schedule(self.backend.delete(key))
+
+    def discard_all(self) -> None:
+        self._generation += 1
+        self._schedule(self.backend.clear())
+
+    def stats(self) -> dict[str, Any]:
+        return self.backend.stats()
+
+
+_client_cache: Optional[ClientCache] = None
+
+
+def check_client_cache(settings: Settings, workers: int) -> None:
+    # Each worker keeps its own cache; writes made by the others only reach it through the NOTIFY change feed.
+    if settings.client_cache_enabled and workers > 1 and not settings.client_changes_notify:
+        raise ValueError("CLIENT_CACHE_ENABLED with more than one worker requires CLIENT_CHANGES_NOTIFY=true.")
+
+
+def init_client_cache(settings: Settings) -> Optional[ClientCache]:
+    global _client_cache
+    check_client_cache(settings, settings.web_concurrency or 1)
+    _client_cache = (
+        ClientCache(InMemoryCacheBackend(settings.client_cache_size), settings.client_cache_ttl)
+        if settings.client_cache_enabled else None
+    )
+    return _client_cache
+
+
+def get_client_cache() -> Optional[ClientCache]:
+    return _client_cache
+
+
+def _invalidate_changed_clients(changes: List[dict]) -> None:
+    if _client_cache is not None:
+        _client_cache.discard(change["client"]["id"] for change in changes)
+
+
+def _invalidate_all_clients() -> None:
+    # The feed restarts when changes may have been missed; any cached client may be stale.
+    if _client_cache is not None:
+        _client_cache.discard_all()
+
+
+client_changes.subscribe(_invalidate_changed_clients, _invalidate_all_clients)
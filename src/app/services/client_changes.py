@@ -0,0 +1,244 @@
+import asyncio
+import json
+import logging
+import uuid
+from collections import deque
+from typing import AsyncIterator, Callable, Iterable, Iterator, List, Optional
+
+import asyncpg
+from sqlalchemy import event, func, select
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from src.app.core.config import Settings, get_settings
+from src.app.core.metrics import Counter
+from src.app.core.serialization import dumps
+from src.app.models.client import client_change_sequence
+from src.app.core.streaming import SSE_KEEP_ALIVE, sse_event
+
+NOTIFY_CHANNEL = "client_changes"
+# pg_advisory_xact_lock key held from numbering a transaction's changes until it commits.
+NOTIFY_SEQUENCE_LOCK = 7_316_001
+SHARED_EPOCH = "g"
+NOTIFY_PAYLOAD_LIMIT = 7500
+PENDING_CHANGES = "client_changes"
+
+logger = logging.getLogger(__name__)
+
+client_changes_published = Counter("client_changes_published_total", "Client change events added to the feed.")
+client_changes_listener_restarts = Counter("client_changes_listener_restarts_total",
+                                           "Times the change feed's LISTEN connection was lost or failed to open.")
+
+
+class ClientChangeFeed:
+    def __init__(self, buffer_size: int):
+        # Without NOTIFY, sequences are numbered per process, so cursors carry a random epoch and a cursor issued
+        # by another worker (or before a restart) is answered with a reset instead of skipping or repeating events.
+        # With NOTIFY, changes are numbered by a database sequence in commit order and every worker shares an epoch.
+        self.epoch = uuid.uuid4().hex[:12]
+        self.sequence = 0
+        self.floor = 0
+        self.notify = False
+        self._events = deque(maxlen=buffer_size)
+        self._waiters: set[asyncio.Event] = set()
+        self._subscribers: List[Callable[[List[dict]], None]] = []
+        self._reset_subscribers: List[Callable[[], None]] = []
+
+    def subscribe(self, on_changes: Callable[[List[dict]], None], on_reset: Callable[[], None]) -> None:
+        self._subscribers.append(on_changes)
+        self._reset_subscribers.append(on_reset)
+
+    def restart(self, epoch: Optional[str] = None, sequence: int = 0) -> None:
+        # Changes may have been missed (the LISTEN connection was down): forget every cursor issued so far.
+        self.epoch = epoch or uuid.uuid4().hex[:12]
+        self.sequence = self.floor = sequence
+        self._events.clear()
+        for callback in self._reset_subscribers:
+            callback()
+        for waiter in self._waiters:
+            waiter.set()
+
+    def resize(self, buffer_size: int) -> None:
+        self._events = deque(self._events, maxlen=buffer_size)
+
+    @property
+    def shared(self) -> bool:
+        return self.epoch == SHARED_EPOCH
+
+    @property
+    def cursor(self) -> str:
+        return self._cursor(self.sequence)
+
+    def _cursor(self, sequence: int) -> str:
+        return f"{self.epoch}-{sequence}"
+
+    def _sequence(self, cursor: str) -> Optional[int]:
+        epoch, _, sequence = cursor.partition("-")
+        return int(sequence) if epoch == self.epoch and sequence.isdigit() else None
+
+    def publish(self, changes: Iterable[dict], sequences: Optional[Iterable[int]] = None) -> None:
+        changes = list(changes)
+        if sequences is None:
+            sequences = range(self.sequence + 1, self.sequence + 1 + len(changes))
+        for sequence, change in zip(sequences, changes):
+            if sequence <= self.floor:
+                # Committed before the LISTEN connection read the sequence; already behind every cursor issued.
+                continue
+            if len(self._events) == self._events.maxlen:
+                self.floor = self._events[0][0] if self._events else sequence
+            self.sequence = max(self.sequence, sequence)
+            self._events.append((sequence, {"cursor": self._cursor(sequence), **change}))
+            client_changes_published.inc()
+        for callback in self._subscribers:
+            callback(changes)
+        for waiter in self._waiters:
+            waiter.set()
+
+    def since(self, cursor: str) -> Optional[List[dict]]:
+        sequence = self._sequence(cursor)
+        if sequence is None or sequence < self.floor:
+            return None
+        if sequence > self.sequence:
+            # Another worker may already have delivered a change this one has not received yet.
+            return [] if self.shared else None
+        changes = []
+        for number, change in reversed(self._events):
+            if number <= sequence:
+                break
+            changes.append(change)
+        return changes[::-1]
+
+    async def wait(self, timeout: float) -> bool:
+        waiter = asyncio.Event()
+        self._waiters.add(waiter)
+        try:
+            await asyncio.wait_for(waiter.wait(), timeout)
+            return True
+        except asyncio.TimeoutError:
+            return False
+        finally:
+            self._waiters.discard(waiter)
+
+    async def stream(self, after: Optional[str], heartbeat: float) -> AsyncIterator[bytes]:
+        position = self.cursor if after is None else after
+        while True:
+            changes = self.since(position)
+            if changes is None:
+                position = self.cursor
+                yield sse_event({"cursor": position}, event="reset", event_id=position)
+            elif changes:
+                position = changes[-1]["cursor"]
+                yield b"".join(sse_event(change, f"client.{change['type']}", change["cursor"])
+                               for change in changes)
+            elif not await self.wait(heartbeat):
+                yield SSE_KEEP_ALIVE
+
+
+# Sized from Settings.client_changes_buffer_size when the app starts.
+client_changes = ClientChangeFeed(0)
+
+
+def record_client_changes(db: AsyncSession, change_type: str, clients: Iterable[dict]) -> None:
+    db.info.setdefault(PENDING_CHANGES, []).extend({"type": change_type, "client": client} for client in clients)
+
+
+def _notifies(session: Session) -> bool:
+    return get_settings().client_changes_notify and session.get_bind().dialect.name == "postgresql"
+
+
+def _notify_payloads(changes: List[dict]) -> Iterator[str]:
+    batch = []
+    size = 2
+    for change in changes:
+        encoded = dumps(change).decode()
+        if batch and size + len(encoded) + 1 > NOTIFY_PAYLOAD_LIMIT:
+            yield f"[{','.join(batch)}]"
+            batch = []
+            size = 2
+        batch.append(encoded)
+        size += len(encoded) + 1
+    if batch:
+        yield f"[{','.join(batch)}]"
+
+
+@event.listens_for(Session, "before_commit")
+def _notify_pending_changes(session: Session) -> None:
+    changes = session.info.get(PENDING_CHANGES)
+    if changes and _notifies(session):
+        # Holding the lock until commit makes the numbers follow commit order, which is the order NOTIFY delivers.
+        session.execute(select(func.pg_advisory_xact_lock(NOTIFY_SEQUENCE_LOCK)))
+        sequences = sorted(session.execute(
+            select(client_change_sequence.next_value()).select_from(func.generate_series(1, len(changes)))
+        ).scalars())
+        numbered = [{"sequence": sequence, **change} for sequence, change in zip(sequences, changes)]
+        for payload in _notify_payloads(numbered):
+            session.execute(select(func.pg_notify(NOTIFY_CHANNEL, payload)))
+
+
+@event.listens_for(Session, "after_commit")
+def _publish_pending_changes(session: Session) -> None:
+    changes = session.info.pop(PENDING_CHANGES, None)
+    # Until the LISTEN connection is up, this worker's own changes would never reach its feed.
+    if changes and not client_changes.notify:
+        client_changes.publish(changes)
+
+
+@event.listens_for(Session, "after_soft_rollback")
+def _discard_pending_changes(session: Session, previous_transaction) -> None:
+    session.info.pop(PENDING_CHANGES, None)
+
+
+def _on_notification(connection, pid, channel, payload) -> None:
+    changes = json.loads(payload)
+    client_changes.publish(changes, [change.pop("sequence") for change in changes])
+
+
+async def _listen(dsn: str, interval: float) -> None:
+    connection = await asyncpg.connect(dsn)
+    try:
+        lost = asyncio.Event()
+        connection.add_termination_listener(lambda _: lost.set())
+        await connection.add_listener(NOTIFY_CHANNEL, _on_notification)
+        # No transaction is between numbering and committing its changes while the lock is held, so every change
+        # numbered after this value will be delivered to this connection.
+        async with connection.transaction():
+            await connection.execute("SELECT pg_advisory_xact_lock($1)", NOTIFY_SEQUENCE_LOCK)
+            sequence = await connection.fetchval(
+                f"SELECT CASE WHEN is_called THEN last_value ELSE 0 END FROM {client_change_sequence.name}"
+            )
+        client_changes.notify = True
+        client_changes.restart(SHARED_EPOCH, sequence)
+        while not lost.is_set():
+            try:
+                await asyncio.wait_for(lost.wait(), interval)
+            except asyncio.TimeoutError:
+                await asyncio.wait_for(connection.execute("SELECT 1"), interval)
+    finally:
+        if client_changes.notify:
+            client_changes.notify = False
+            client_changes.restart()
+        connection.terminate()
+
+
+async def _supervise(settings: Settings) -> None:
+    # A dedicated connection outside the engine pools: it is held for the whole life of the worker.
+    dsn = make_url(settings.sqlalchemy_database_url).set(drivername="postgresql").render_as_string(
+        hide_password=False
+    )
+    while True:
+        try:
+            await _listen(dsn, settings.client_changes_heartbeat)
+        except (OSError, asyncio.TimeoutError, asyncpg.PostgresError, asyncpg.InterfaceError) as e:
+            logger.warning("Client change feed lost its LISTEN connection: %s", e)
+        client_changes_listener_restarts.inc()
+        await asyncio.sleep(settings.client_changes_retry)
+
+
+def listen_for_client_changes(settings: Settings) -> asyncio.Task:
+    return asyncio.create_task(_supervise(settings))
+
+
+async def stop_listening_for_client_changes(listener: asyncio.Task) -> None:
+    listener.cancel()
+    await asyncio.gather(listener, return_exceptions=True)
@@ -0,0 +1,234 @@
+import asyncio
+import csv
+import os
+import time
+import uuid
+from typing import AsyncIterable, Dict, List, Optional, Tuple, Type
+
+from fastapi import HTTPException, status
+from pydantic import BaseModel, ValidationError
+from sqlalchemy import delete, select, update
+
+from src.app.core.config import get_settings
+from src.app.core.exceptions import NotFound
+from src.app.core.metrics import Counter
+from src.app.db.database import SessionLocal
+from src.app.models.client_import_job import ClientImportJob
+from src.app.services.client import CLIENT_FIELDS, ClientService
+
+IMPORT_COLUMNS = [field for field in CLIENT_FIELDS if field != "id"]
+
+client_import_rows = Counter("client_import_rows_total", "Rows read by CSV import jobs, by outcome.", ("outcome",))
+
+JOB_FIELDS = ("status", "processed", "created", "rejected", "error", "started_at", "finished_at")
+
+# Jobs run on the worker that received the upload; their state lives in client_import_jobs and their files in
+# CLIENT_IMPORT_DIR, so any worker can report on them.
+_tasks: Dict[str, asyncio.Task] = {}
+_slots: Optional[asyncio.Semaphore] = None
+
+
+def _job_path(job_id: str) -> str:
+    return os.path.join(get_settings().client_import_dir, f"{job_id}.csv")
+
+
+class ImportJob:
+    def __init__(self, job_id: Optional[str] = None):
+        self.id = job_id or uuid.uuid4().hex
+        self.path = _job_path(self.id)
+        self.rejected_path = f"{self.path}.rejected.csv"
+        self.status = "queued"
+        self.processed = 0
+        self.created = 0
+        self.rejected = 0
+        self.error: Optional[str] = None
+        self.started_at: Optional[float] = None
+        self.finished_at: Optional[float] = None
+
+    @classmethod
+    def from_row(cls, row: ClientImportJob) -> "ImportJob":
+        job = cls(row.id)
+        for field in JOB_FIELDS:
+            setattr(job, field, getattr(row, field))
+        return job
+
+    @property
+    def finished(self) -> bool:
+        return self.status in ("completed", "failed")
+
+    def to_dict(self) -> dict:
+        elapsed = (self.finished_at or time.time()) - self.started_at if self.started_at else 0.0
+        return {
+            "id": self.id,
+            "status": self.status,
+            "processed": self.processed,
+            "created": self.created,
+            "rejected": self.rejected,
+            "elapsed_seconds": round(elapsed, 3),
+            "rows_per_second": round(self.processed / elapsed, 1) if elapsed else 0.0,
+            "error": self.error,
+        }
+
+    async def save(self) -> None:
+        async with SessionLocal() as db:
+            await db.execute(update(ClientImportJob).where(ClientImportJob.id == self.id).values(
+                {field: getattr(self, field) for field in JOB_FIELDS}
+            ))
+            await db.commit()
+
+
+def _discard_files(job_id: str) -> None:
+    path = _job_path(job_id)
+    for job_path in (path, f"{path}.rejected.csv"):
+        if os.path.exists(job_path):
+            os.remove(job_path)
+
+
+def _read_header(path: str) -> List[str]:
+    with open(path, newline="", encoding="utf-8-sig") as source:
+        return next(csv.reader(source), [])
+
+
+def _read_rows(reader: csv.DictReader, size: int) -> List[Tuple[int, dict]]:
+    rows = []
+    for row in reader:
+        rows.append((reader.line_num, row))
+        if len(rows) >= size:
+            break
+    return rows
+
+
+def _validation_detail(error: ValidationError) -> str:
+    return "; ".join(f"{'.'.join(str(part) for part in item['loc'])}: {item['msg']}" for item in error.errors())
+
+
+async def _import_chunk(job: ImportJob, rows: List[Tuple[int, dict]], schema: Type[BaseModel],
+                        rejected: csv.DictWriter) -> None:
+    def reject(line: int, row: dict, detail: str) -> None:
+        rejected.writerow({**row, "line": line, "error": detail})
+        job.rejected += 1
+        client_import_rows.labels("rejected").inc()
+
+    valid = []
+    for line, row in rows:
+        try:
+            valid.append((line, row, schema(**{column: row.get(column) for column in IMPORT_COLUMNS}).dict()))
+        except ValidationError as e:
+            reject(line, row, _validation_detail(e))
+
+    if valid:
+        async with SessionLocal() as db:
+            results = await ClientService.bulk_create_clients(db, [client_data for _, _, client_data in valid])
+        for (line, row, _), result in zip(valid, results):
+            if result["status"] == "created":
+                job.created += 1
+                client_import_rows.labels("created").inc()
+            else:
+                reject(line, row, result["detail"])
+
+    job.processed += len(rows)
+    await job.save()
+
+
+async def _run(job: ImportJob, schema: Type[BaseModel]) -> None:
+    async with _slots:
+        job.status = "running"
+        job.started_at = time.time()
+        try:
+            await job.save()
+            with open(job.path, newline="", encoding="utf-8-sig") as source, \
+                    open(job.rejected_path, "w", newline="", encoding="utf-8") as rejected_file:
+                reader = csv.DictReader(source)
+                rejected = csv.DictWriter(rejected_file, ["line", *(reader.fieldnames or []), "error"],
+                                          extrasaction="ignore")
+                rejected.writeheader()
+                while True:
+                    rows = await asyncio.to_thread(_read_rows, reader, get_settings().client_import_chunk_size)
+                    if not rows:
+                        break
+                    await _import_chunk(job, rows, schema, rejected)
+            job.status = "completed"
+        except asyncio.CancelledError:
+            job.status = "failed"
+            job.error = "Import was interrupted by a server shutdown."
+            raise
+        except Exception as e:
+            job.status = "failed"
+            job.error = str(e)
+        finally:
+            job.finished_at = time.time()
+            os.remove(job.path)
+            await job.save()
+
+
+class ClientImportService:
+    @staticmethod
+    async def start_import(chunks: AsyncIterable[bytes], schema: Type[BaseModel]) -> ImportJob:
+        global _slots
+        settings = get_settings()
+        os.makedirs(settings.client_import_dir, exist_ok=True)
+        job = ImportJob()
+        try:
+            size = 0
+            with open(job.path, "wb") as upload:
+                async for chunk in chunks:
+                    size += len(chunk)
+                    if size > settings.client_import_max_bytes:
+                        raise HTTPException(
+                            status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+                            detail=f"Import files can have at most {settings.client_import_max_bytes} bytes."
+                        )
+                    upload.write(chunk)
+            try:
+                header = await asyncio.to_thread(_read_header, job.path)
+            except (UnicodeDecodeError, csv.Error):
+                raise HTTPException(
+                    status_code=status.HTTP_400_BAD_REQUEST,
+                    detail="Import files must be UTF-8 encoded CSV."
+                )
+            missing = [column for column in IMPORT_COLUMNS if column not in header]
+            if missing:
+                raise HTTPException(
+                    status_code=status.HTTP_400_BAD_REQUEST,
+                    detail=f"CSV is missing columns: {', '.join(missing)}."
+                )
+
+            async with SessionLocal() as db:
+                db.add(ClientImportJob(id=job.id, status=job.status, submitted_at=time.time()))
+                expired = (await db.scalars(
+                    select(ClientImportJob.id)
+                    .where(ClientImportJob.status.in_(("completed", "failed")))
+                    .order_by(ClientImportJob.submitted_at.desc())
+                    .offset(settings.client_import_max_jobs)
+                )).all()
+                if expired:
+                    await db.execute(delete(ClientImportJob).where(ClientImportJob.id.in_(expired)))
+                await db.commit()
+        except BaseException:
+            os.remove(job.path)
+            raise
+
+        for job_id in expired:
+            _discard_files(job_id)
+        if _slots is None:
+            _slots = asyncio.Semaphore(settings.client_import_concurrency)
+        task = _tasks[job.id] = asyncio.create_task(_run(job, schema))
+        task.add_done_callback(lambda _: _tasks.pop(job.id, None))
+        return job
+
+    @staticmethod
+    async def get_job(job_id: str) -> ImportJob:
+        async with SessionLocal() as db:
+            row = await db.get(ClientImportJob, job_id)
+        if row is None:
+            raise NotFound("Import job not found.")
+        return ImportJob.from_row(row)
+
+
+async def shutdown_import_jobs() -> None:
+    global _slots
+    tasks = list(_tasks.values())
+    for task in tasks:
+        task.cancel()
+    await asyncio.gather(*tasks, return_exceptions=True)
+    _slots = None
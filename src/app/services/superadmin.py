@@ -1,31 +1,27 @@
-from sqlalchemy.orm import Session
+from typing import Optional
 
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.app.core.config import Settings, get_settings
 from src.app.core.exceptions import NotFound
 from src.app.core.hashing import hash_password
 
-import os
-from dotenv import load_dotenv
-
 from src.app.models.admin import Admin
 from src.app.models.superadmin import SuperAdmin
 
-load_dotenv()
-
-SUPER_ADMIN_EMAIL = os.getenv("SUPER_ADMIN_EMAIL")
-SUPER_ADMIN_USERNAME = os.getenv("SUPER_ADMIN_USERNAME")
-SUPER_ADMIN_PASSWORD = os.getenv("SUPER_ADMIN_PASSWORD")
-
 
-def create_super_admin(db: Session):
-    super_admin = db.query(SuperAdmin).filter(SuperAdmin.username == SUPER_ADMIN_USERNAME).first()
+async def create_super_admin(db: AsyncSession, settings: Optional[Settings] = None):
+    settings = settings or get_settings()
+    super_admin = await db.scalar(select(SuperAdmin).filter(SuperAdmin.username == settings.super_admin_username))
 
     if not super_admin:
-        hashed_password = hash_password(SUPER_ADMIN_PASSWORD)
+        hashed_password = await hash_password(settings.super_admin_password)
         super_admin = SuperAdmin(
-            email=SUPER_ADMIN_EMAIL,
-            username=SUPER_ADMIN_USERNAME,
+            email=settings.super_admin_email,
+            username=settings.super_admin_username,
             password=hashed_password
         )
         db.add(super_admin)
-        db.commit()
-        db.refresh(super_admin)
+        await db.commit()
+        await db.refresh(super_admin)
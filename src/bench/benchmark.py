@@ -0,0 +1,297 @@
+import argparse
+import asyncio
+import itertools
+import json
+import os
+import platform
+import random
+import sys
+import tempfile
+import time
+from datetime import datetime, timezone
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Drive every endpoint of the app in-process and report throughput.")
+    parser.add_argument("--database-url", help="Async SQLAlchemy URL. Defaults to a temporary SQLite file.")
+    parser.add_argument("--reset", action="store_true",
+                        help="Drop the app tables of a --database-url that already has tables before seeding.")
+    parser.add_argument("--clients", type=int, default=10000, help="Clients seeded before the run.")
+    parser.add_argument("--admins", type=int, default=100, help="Admins seeded before the run.")
+    parser.add_argument("--requests", type=int, default=500, help="Requests per endpoint.")
+    parser.add_argument("--login-requests", type=int, default=50, help="Requests for bcrypt-bound endpoints.")
+    parser.add_argument("--concurrency", type=int, default=20, help="Requests in flight per endpoint.")
+    parser.add_argument("--only", nargs="*", help="Run only the scenarios with these names.")
+    parser.add_argument("--output", default="benchmark-results.json", help="Where to write the JSON results.")
+    parser.add_argument("--baseline", help="Previous results file to compare against.")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--startup", action="store_true",
+                        help="Measure import and worker start time in fresh interpreters instead.")
+    parser.add_argument("--startup-runs", type=int, default=10, help="Fresh interpreters per startup measurement.")
+    return parser.parse_args()
+
+
+def configure_environment(args):
+    database_url = args.database_url or f"sqlite+aiosqlite:///{os.path.join(tempfile.mkdtemp(), 'bench.db')}"
+    os.environ.update({
+        "SQLALCHEMY_DATABASE_URL": database_url,
+        "ENVIRONMENT_TYPE": "benchmark",
+        "SCHEMA_BOOTSTRAP": "none",
+        "SECRET_KEY": os.getenv("SECRET_KEY") or "benchmark-secret-key",
+        "SUPER_ADMIN_EMAIL": "bench-root@example.com",
+        "SUPER_ADMIN_USERNAME": "bench-root",
+        "SUPER_ADMIN_PASSWORD": "bench-root-password",
+    })
+    return database_url
+
+
+def percentile(sorted_values, fraction):
+    if not sorted_values:
+        return 0.0
+    index = max(0, min(len(sorted_values) - 1, round(fraction * len(sorted_values) + 0.5) - 1))
+    return sorted_values[index]
+
+
+async def seed(args):
+    from sqlalchemy import inspect, insert
+
+    from src.app.core.hashing import hash_password
+    from src.app.db.database import Base, SessionLocal, init_engine
+    from src.app.models.admin import Admin
+    from src.app.models.client import Client, Status
+    from src.app.services.client import ClientService
+    from src.app.services.superadmin import create_super_admin
+
+    async with init_engine().begin() as connection:
+        tables = await connection.run_sync(lambda sync_connection: inspect(sync_connection).get_table_names())
+        if tables and not args.reset:
+            raise SystemExit(f"The benchmark database already has tables ({', '.join(sorted(tables))}). "
+                             "Point --database-url at an empty database, or pass --reset to drop them.")
+        await connection.run_sync(Base.metadata.drop_all)
+        await connection.run_sync(Base.metadata.create_all)
+
+    statuses = list(Status)
+    async with SessionLocal() as db:
+        await create_super_admin(db)
+        admin_password = await hash_password("bench-admin-password")
+        if args.admins:
+            await db.execute(insert(Admin), [
+                {"email": f"admin{i}@example.com", "username": f"admin{i}", "password": admin_password}
+                for i in range(args.admins)
+            ])
+        for start in range(0, args.clients, 5000):
+            await db.execute(insert(Client), [
+                {"email": f"client{i}@example.com", "username": f"client{i}", "phone": f"{i:011d}",
+                 "status": statuses[i % len(statuses)]}
+                for i in range(start, min(start + 5000, args.clients))
+            ])
+        await db.commit()
+        await ClientService.reconcile_status_counts(db)
+
+
+def build_scenarios(args):
+    rng = random.Random(args.seed)
+    sequence = itertools.count()
+    client_ids = list(range(1, args.clients + 1))
+    admin_ids = list(range(1, args.admins + 1))
+    deletable_clients = iter(reversed(client_ids))
+    deletable_admins = iter(reversed(admin_ids))
+
+    def new_client():
+        n = next(sequence)
+        return {"email": f"bench{n}@example.com", "username": f"bench{n}", "phone": "11999999999",
+                "status": "active"}
+
+    def updated_client(client_id):
+        return {"email": f"client{client_id - 1}@example.com", "username": f"client{client_id - 1}",
+                "phone": "11888888888", "status": rng.choice(["active", "inactive", "suspended"])}
+
+    def updated_admin(admin_id):
+        return {"email": f"admin{admin_id - 1}@example.com", "username": f"admin{admin_id - 1}"}
+
+    def new_admin():
+        n = next(sequence)
+        return {"email": f"bench-admin{n}@example.com", "username": f"badmin{n}", "password": "bench-password"}
+
+    def update_client():
+        client_id = rng.choice(client_ids[:args.clients // 2])
+        return "PUT", f"/clients/{client_id}", {"json": updated_client(client_id)}
+
+    def update_admin():
+        admin_id = rng.choice(admin_ids[:args.admins // 2])
+        return "PUT", f"/admins/{admin_id}", {"json": updated_admin(admin_id)}
+
+    login = {"username": "admin0", "password": "bench-admin-password"}
+    # (name, expected status, request count, request factory returning (method, url, httpx kwargs))
+    return [
+        ("login", 200, args.login_requests, lambda: ("POST", "/security/token", {"data": login})),
+        ("users_me", 200, args.requests, lambda: ("GET", "/security/users/me", {})),
+        ("list_clients", 200, args.requests, lambda: ("GET", "/clients/list-clients", {"params": {"limit": 50}})),
+        ("search_clients", 200, args.requests,
+         lambda: ("GET", "/clients/list-clients",
+                  {"params": {"search": f"client{rng.randrange(100)}", "status": "active", "sort": "username"}})),
+        ("get_client", 200, args.requests, lambda: ("GET", f"/clients/{rng.choice(client_ids)}", {})),
+        ("batch_get_clients", 200, args.requests,
+         lambda: ("POST", "/clients/batch-get", {"json": {"ids": rng.sample(client_ids, min(200, len(client_ids)))}})),
+        ("client_stats", 200, args.requests, lambda: ("GET", "/clients/stats", {})),
+        ("export_clients", 200, max(1, args.requests // 50), lambda: ("GET", "/clients/export", {})),
+        ("create_client", 201, args.requests, lambda: ("POST", "/clients/create-client", {"json": new_client()})),
+        ("bulk_create_clients", 200, max(1, args.requests // 10),
+         lambda: ("POST", "/clients/bulk-create", {"json": [new_client() for _ in range(100)]})),
+        ("update_client", 200, args.requests, update_client),
+        ("list_admins", 200, args.requests, lambda: ("GET", "/admins/list-admins", {"params": {"limit": 50}})),
+        ("get_admin", 200, args.requests, lambda: ("GET", f"/admins/{rng.choice(admin_ids)}", {})),
+        ("update_admin", 200, args.requests, update_admin),
+        ("create_admin", 201, args.login_requests,
+         lambda: ("POST", "/security/create-admin", {"json": new_admin()})),
+        ("db_pool", 200, args.requests, lambda: ("GET", "/internal/db-pool", {})),
+        ("metrics", 200, args.requests, lambda: ("GET", "/metrics", {})),
+        ("delete_client", 204, min(args.requests, args.clients // 2),
+         lambda: ("DELETE", f"/clients/{next(deletable_clients)}", {})),
+        ("delete_admin", 204, min(args.requests, args.admins // 2),
+         lambda: ("DELETE", f"/admins/{next(deletable_admins)}", {})),
+    ]
+
+
+async def run_scenario(http, expected_status, total, make_request, concurrency):
+    requests = [make_request() for _ in range(total)]
+    latencies = []
+    errors = 0
+    cursor = iter(requests)
+
+    async def worker():
+        nonlocal errors
+        for method, url, kwargs in cursor:
+            started = time.perf_counter()
+            response = await http.request(method, url, **kwargs)
+            latencies.append(time.perf_counter() - started)
+            if response.status_code != expected_status:
+                errors += 1
+
+    started = time.perf_counter()
+    await asyncio.gather(*[worker() for _ in range(max(1, min(concurrency, total)))])
+    elapsed = time.perf_counter() - started
+
+    latencies.sort()
+    return {
+        "requests": total,
+        "errors": errors,
+        "duration_s": round(elapsed, 4),
+        "rps": round(total / elapsed, 2) if elapsed else 0.0,
+        "p50_ms": round(percentile(latencies, 0.50) * 1000, 3),
+        "p95_ms": round(percentile(latencies, 0.95) * 1000, 3),
+        "p99_ms": round(percentile(latencies, 0.99) * 1000, 3),
+    }
+
+
+async def run(args):
+    import httpx
+
+    from main import app
+    from src.app.core.jwt_handler import create_access_token
+    from src.app.db.database import dispose_engine
+
+    await seed(args)
+
+    token = create_access_token({"sub": "bench-root", "role": "super_admin"})
+    transport = httpx.ASGITransport(app=app)
+    results = {}
+    async with httpx.AsyncClient(transport=transport, base_url="http://benchmark",
+                                 headers={"Authorization": f"Bearer {token}"}, timeout=None) as http:
+        for name, expected_status, total, make_request in build_scenarios(args):
+            if (args.only and name not in args.only) or total <= 0:
+                continue
+            results[name] = await run_scenario(http, expected_status, total, make_request, args.concurrency)
+            print_result(name, results[name])
+    await dispose_engine()
+    return results
+
+
+STARTUP_PROBES = {
+    "import_fastapi": "import fastapi",
+    "import_app": "import main",
+    "worker_start": (
+        "import asyncio, main\n"
+        "async def start():\n"
+        "    async with main.app.router.lifespan_context(main.app):\n"
+        "        pass\n"
+        "asyncio.run(start())"
+    ),
+}
+
+
+def measure_startup(args):
+    import statistics
+    import subprocess
+
+    results = {}
+    for name, code in STARTUP_PROBES.items():
+        script = f"import time\nt = time.perf_counter()\n{code}\nprint(time.perf_counter() - t)\n"
+        samples = []
+        for _ in range(args.startup_runs):
+            output = subprocess.run([sys.executable, "-c", script], check=True, capture_output=True, text=True,
+                                    cwd=ROOT_DIR)
+            samples.append(float(output.stdout.split()[0]))
+        samples.sort()
+        results[name] = {
+            "runs": len(samples),
+            "median_ms": round(statistics.median(samples) * 1000, 3),
+            "min_ms": round(samples[0] * 1000, 3),
+            "max_ms": round(samples[-1] * 1000, 3),
+        }
+        print(f"{name:<22} median {results[name]['median_ms']:>9.2f} ms  min {results[name]['min_ms']:>9.2f} ms  "
+              f"max {results[name]['max_ms']:>9.2f} ms")
+    return results
+
+
+def print_result(name, result, baseline=None):
+    line = (f"{name:<22} {result['rps']:>10.1f} req/s  p50 {result['p50_ms']:>9.2f} ms  "
+            f"p95 {result['p95_ms']:>9.2f} ms  p99 {result['p99_ms']:>9.2f} ms  errors {result['errors']}")
+    if baseline:
+        change = (result["rps"] - baseline["rps"]) / baseline["rps"] * 100 if baseline["rps"] else 0.0
+        line += f"  ({change:+.1f}% req/s vs baseline)"
+    print(line)
+
+
+def compare(results, baseline_path):
+    with open(baseline_path) as baseline_file:
+        baseline = json.load(baseline_file)["results"]
+    print(f"\nCompared with {baseline_path}:")
+    for name, result in results.items():
+        if "rps" in result:
+            print_result(name, result, baseline.get(name))
+        elif name in baseline:
+            change = (result["median_ms"] - baseline[name]["median_ms"]) / baseline[name]["median_ms"] * 100
+            print(f"{name:<22} median {result['median_ms']:>9.2f} ms  ({change:+.1f}% vs baseline)")
+
+
+def main():
+    args = parse_args()
+    database_url = configure_environment(args)
+    if args.startup:
+        results = measure_startup(args)
+    else:
+        results = asyncio.run(run(args))
+
+    report = {
+        "timestamp": datetime.now(timezone.utc).isoformat(),
+        "python": sys.version.split()[0],
+        "platform": platform.platform(),
+        "database": database_url.split("://", 1)[0],
+        "config": {key: getattr(args, key) for key in ("clients", "admins", "requests", "login_requests",
+                                                        "concurrency", "seed")},
+        "mode": "startup" if args.startup else "requests",
+        "results": results,
+    }
+    with open(args.output, "w") as output_file:
+        json.dump(report, output_file, indent=2)
+    print(f"\nResults written to {args.output}")
+
+    if args.baseline:
+        compare(results, args.baseline)
+
+
+if __name__ == "__main__":
+    main()
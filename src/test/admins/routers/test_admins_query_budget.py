@@ -0,0 +1,56 @@
+ADMIN_DATA = {'email': 'admin@gmail.com', 'username': 'admin', 'password': 'admin-password'}
+
+
+def create_admin(client):
+    response = client.post("/security/create-admin", json=ADMIN_DATA)
+    assert response.status_code == 201
+    return response
+
+
+def test_create_admin_queries(client, assert_queries):
+    assert_queries(create_admin(client))
+
+
+def test_login_queries(client, assert_queries):
+    create_admin(client)
+
+    response = client.post("/security/token", data={'username': 'admin', 'password': 'admin-password'})
+
+    assert response.status_code == 200
+    assert_queries(response, 1)
+
+
+def test_list_admins_queries(client, assert_queries):
+    create_admin(client)
+
+    response = client.get("/admins/list-admins")
+
+    assert response.status_code == 200
+    assert_queries(response, 1)
+
+
+def test_get_admin_by_id_queries(client, assert_queries):
+    admin_id = create_admin(client).json()['id']
+
+    response = client.get(f"/admins/{admin_id}")
+
+    assert response.status_code == 200
+    assert_queries(response, 1)
+
+
+def test_update_admin_queries(client, assert_queries):
+    admin_id = create_admin(client).json()['id']
+
+    response = client.put(f"/admins/{admin_id}", json={'email': 'new@gmail.com', 'username': 'admin'})
+
+    assert response.status_code == 200
+    assert_queries(response, 1)
+
+
+def test_delete_admin_queries(client, assert_queries):
+    admin_id = create_admin(client).json()['id']
+
+    response = client.delete(f"/admins/{admin_id}")
+
+    assert response.status_code == 204
+    assert_queries(response, 1)
@@ -0,0 +1,40 @@
+ADMIN_DATA = {'email': 'admin@gmail.com', 'username': 'admin', 'password': 'admin-password'}
+OTHER_DATA = {'email': 'other@gmail.com', 'username': 'other', 'password': 'other-password'}
+
+
+def create_two_admins(client):
+    first = client.post("/security/create-admin", json=ADMIN_DATA).json()["id"]
+    client.post("/security/create-admin", json=OTHER_DATA)
+    return first
+
+
+def test_update_with_a_taken_email(client):
+    admin_id = create_two_admins(client)
+
+    response = client.put(f"/admins/{admin_id}", json={'username': 'admin', 'email': OTHER_DATA['email']})
+
+    assert response.status_code == 400
+    assert response.json()["detail"] == "Email already registered."
+
+
+def test_update_with_a_taken_username(client):
+    admin_id = create_two_admins(client)
+
+    response = client.put(f"/admins/{admin_id}", json={'username': 'other', 'email': ADMIN_DATA['email']})
+
+    assert response.status_code == 400
+    assert response.json()["detail"] == "Username already taken."
+
+
+def test_update_reports_every_conflict(client):
+    admin_id = create_two_admins(client)
+
+    response = client.put(f"/admins/{admin_id}", json={'username': 'other', 'email': OTHER_DATA['email']})
+
+    assert response.status_code == 400
+    assert response.json()["detail"] == "Email already registered.; Username already taken."
+
+
+def test_update_and_delete_of_a_missing_admin(client):
+    assert client.put("/admins/999", json={'username': 'ghost', 'email': 'ghost@gmail.com'}).status_code == 404
+    assert client.delete("/admins/999").status_code == 404
@@ -5,25 +5,22 @@ from src.app.db.database import Base
 from src.app.core.dependencies import get_db
 from src.app.core.jwt_handler import get_current_user
 from main import app
-from sqlalchemy import create_engine
-from sqlalchemy.orm import sessionmaker
+import asyncio
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
 
 SECRET_KEY = "mysecretkey"
 ALGORITHM = "HS256"
-SQLALCHEMY_DATABASE_URL = "sqlite:///./test.db"
-engineTest = create_engine(SQLALCHEMY_DATABASE_URL, connect_args={"check_same_thread": False})
-TestingSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engineTest)
+SQLALCHEMY_DATABASE_URL = "sqlite+aiosqlite:///./test.db"
+engineTest = create_async_engine(SQLALCHEMY_DATABASE_URL)
+TestingSessionLocal = async_sessionmaker(autoflush=False, expire_on_commit=False, bind=engineTest)
 
 client = TestClient(app)
 
 
 # Funções auxiliares
-def override_get_db():
-    db = TestingSessionLocal()
-    try:
+async def override_get_db():
+    async with TestingSessionLocal() as db:
         yield db
-    finally:
-        db.close()
 
 
 def create_access_token(data: dict, secret_key: str, algorithm: str = "HS256",
@@ -35,8 +32,13 @@ def create_access_token(data: dict, secret_key: str, algorithm: str = "HS256",
 
 
 def recreate_tables():
-    Base.metadata.drop_all(bind=engineTest)
-    Base.metadata.create_all(bind=engineTest)
+    async def recreate():
+        async with engineTest.begin() as connection:
+            await connection.run_sync(Base.metadata.drop_all)
+            await connection.run_sync(Base.metadata.create_all)
+        await engineTest.dispose()
+
+    asyncio.run(recreate())
 
 
 def override_get_current_user():
@@ -86,7 +88,7 @@ def test_list_clients():
     headers = {"Authorization": f"Bearer {token}"}
     response = client.get("/client/list-clients", headers=headers)
     assert response.status_code == 200
-    assert len(response.json()) == 2
+    assert len(response.json()["items"]) == 2
 
 
 def test_get_client_by_id():
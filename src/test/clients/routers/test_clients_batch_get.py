@@ -0,0 +1,28 @@
+CLIENT_DATA = {'email': 'lucas@gmail.com', 'username': 'Lucas', 'phone': '987654321', 'status': 'active'}
+
+
+def create_clients(client, count):
+    clients_data = [
+        {**CLIENT_DATA, 'email': f'client{i}@gmail.com', 'username': f'client{i}'} for i in range(count)
+    ]
+    response = client.post("/clients/bulk-create", json=clients_data)
+    assert response.status_code == 200
+
+
+def test_batch_get_returns_found_and_missing(client, assert_queries):
+    create_clients(client, 3)
+
+    response = client.post("/clients/batch-get", json={"ids": [3, 99, 1, 3]})
+
+    assert response.status_code == 200
+    assert [item["username"] for item in response.json()["items"]] == ["client2", "client0"]
+    assert response.json()["missing"] == [99]
+    assert_queries(response, 1)
+
+
+def test_batch_get_is_capped(client, override_settings):
+    override_settings(batch_get_max_ids=2)
+
+    response = client.post("/clients/batch-get", json={"ids": [1, 2, 3]})
+
+    assert response.status_code == 400
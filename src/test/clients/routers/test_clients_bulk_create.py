@@ -0,0 +1,57 @@
+CLIENT_DATA = {'email': 'lucas@gmail.com', 'username': 'Lucas', 'phone': '987654321', 'status': 'active'}
+
+
+def client_data(name, **changes):
+    return {**CLIENT_DATA, 'email': f'{name}@gmail.com', 'username': name, **changes}
+
+
+def test_bulk_create_rejects_duplicates_within_the_batch(client):
+    response = client.post("/clients/bulk-create", json=[
+        client_data("ana"),
+        client_data("ana", email="other@gmail.com"),
+        client_data("bia", email="ana@gmail.com"),
+        client_data("caio"),
+    ])
+
+    assert response.status_code == 200
+    body = response.json()
+    assert (body["created"], body["rejected"]) == (2, 2)
+    assert [(result["status"], result.get("detail")) for result in body["results"]] == [
+        ("created", None),
+        ("rejected", "Username duplicated in batch."),
+        ("rejected", "Email duplicated in batch."),
+        ("created", None),
+    ]
+
+
+def test_bulk_create_rejects_clients_already_registered(client):
+    client.post("/clients/create-client", json=client_data("ana"))
+
+    response = client.post("/clients/bulk-create", json=[
+        client_data("ana"),
+        client_data("bia", email="ana@gmail.com"),
+        client_data("caio"),
+    ])
+
+    body = response.json()
+    assert (body["created"], body["rejected"]) == (1, 2)
+    assert [result.get("detail") for result in body["results"]] == [
+        "Email already registered.; Username already taken.", "Email already registered.", None,
+    ]
+    assert body["results"][2]["client"]["username"] == "caio"
+
+
+def test_bulk_create_rejects_only_the_rows_the_database_refuses(client, refuse_username):
+    refuse_username("eve")
+
+    response = client.post("/clients/bulk-create", json=[
+        client_data("ana"), client_data("eve"), client_data("caio"), client_data("duda"),
+    ])
+
+    assert response.status_code == 200
+    body = response.json()
+    assert (body["created"], body["rejected"]) == (3, 1)
+    assert (body["results"][1]["status"], body["results"][1]["detail"]) == ("rejected", "Username already taken.")
+    assert [result["client"]["username"] for result in body["results"] if result["status"] == "created"] == \
+        ["ana", "caio", "duda"]
+    assert client.get("/clients/stats").json()["total"] == 3
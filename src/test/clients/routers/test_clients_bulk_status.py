@@ -0,0 +1,54 @@
+CLIENT_DATA = {'email': 'lucas@gmail.com', 'username': 'Lucas', 'phone': '987654321', 'status': 'active'}
+
+
+def create_clients(client, statuses):
+    clients_data = [
+        {**CLIENT_DATA, 'email': f'client{i}@gmail.com', 'username': f'client{i}', 'status': client_status}
+        for i, client_status in enumerate(statuses)
+    ]
+    response = client.post("/clients/bulk-create", json=clients_data)
+    assert response.status_code == 200
+
+
+def statuses(client):
+    return [item["status"] for item in client.get("/clients/list-clients").json()["items"]]
+
+
+def test_bulk_status_by_ids(client, assert_queries):
+    create_clients(client, ["active", "active", "suspended", "active"])
+
+    response = client.post("/clients/bulk-status", json={"status": "suspended", "ids": [1, 3, 4, 99]})
+
+    assert response.status_code == 200
+    assert response.json()["updated"] == 2
+    assert sorted(response.json()["ids"]) == [1, 4]
+    assert statuses(client) == ["suspended", "active", "suspended", "suspended"]
+    assert_queries(response, 3)
+
+
+def test_bulk_status_by_current_status(client):
+    create_clients(client, ["active", "inactive", "inactive"])
+
+    response = client.post("/clients/bulk-status", json={"status": "active", "current_status": "inactive"})
+
+    assert response.json()["updated"] == 2
+    assert statuses(client) == ["active", "active", "active"]
+
+
+def test_bulk_status_requires_a_selection(client):
+    response = client.post("/clients/bulk-status", json={"status": "active"})
+
+    assert response.status_code == 400
+
+
+def test_bulk_status_by_current_status_moves_capped_batches(client, override_settings):
+    override_settings(bulk_status_max_ids=2)
+    create_clients(client, ["inactive", "inactive", "active", "inactive"])
+    request = {"status": "suspended", "current_status": "inactive"}
+
+    first = client.post("/clients/bulk-status", json=request).json()
+    second = client.post("/clients/bulk-status", json=request).json()
+
+    assert (first["ids"], first["has_more"]) == ([1, 2], True)
+    assert (second["ids"], second["has_more"]) == ([4], False)
+    assert statuses(client) == ["suspended", "suspended", "active", "suspended"]
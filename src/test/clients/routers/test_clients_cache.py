@@ -0,0 +1,113 @@
+import asyncio
+from dataclasses import replace
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import update
+
+from main import create_app
+from src.app.core.cache import InMemoryCacheBackend
+from src.app.core.config import get_settings
+from src.app.core.jwt_handler import get_current_user
+from src.app.db.database import SessionLocal
+from src.app.models.client import Client
+from src.app.services.client_cache import ClientCache, check_client_cache, get_client_cache
+from src.app.services.client_changes import client_changes
+from src.test.conftest import override_get_current_user
+
+CLIENT_DATA = {'email': 'lucas@gmail.com', 'username': 'Lucas', 'phone': '987654321', 'status': 'active'}
+
+
+@pytest.fixture
+def cached_client():
+    app = create_app(replace(get_settings(), client_cache_enabled=True))
+    app.dependency_overrides[get_current_user] = override_get_current_user
+    with TestClient(app) as test_client:
+        yield test_client
+
+
+def test_writes_invalidate_the_cached_client(cached_client):
+    client_id = cached_client.post("/clients/create-client", json=CLIENT_DATA).json()["id"]
+    cached_client.get(f"/clients/{client_id}")
+    assert cached_client.get(f"/clients/{client_id}").json()["status"] == "active"
+    assert get_client_cache().stats()["hits"] == 1
+
+    cached_client.put(f"/clients/{client_id}", json={**CLIENT_DATA, 'status': 'inactive'})
+    assert cached_client.get(f"/clients/{client_id}").json()["status"] == "inactive"
+
+    cached_client.post("/clients/bulk-status", json={"status": "suspended", "ids": [client_id]})
+    assert cached_client.get(f"/clients/{client_id}").json()["status"] == "suspended"
+
+    cached_client.delete(f"/clients/{client_id}")
+    assert cached_client.get(f"/clients/{client_id}").status_code == 404
+
+
+def test_changes_from_other_workers_invalidate_the_cached_client(cached_client):
+    client_id = cached_client.post("/clients/create-client", json=CLIENT_DATA).json()["id"]
+    cached_client.get(f"/clients/{client_id}")
+
+    async def update_elsewhere():
+        async with SessionLocal() as db:
+            await db.execute(update(Client).where(Client.id == client_id).values(phone="000"))
+            await db.commit()
+
+    cached_client.portal.call(update_elsewhere)
+    assert cached_client.get(f"/clients/{client_id}").json()["phone"] == CLIENT_DATA["phone"]
+
+    # What the LISTEN connection delivers when another worker commits a change.
+    cached_client.portal.call(lambda: client_changes.publish(
+        [{"type": "updated", "client": {**CLIENT_DATA, "id": client_id, "phone": "000"}}]
+    ))
+    assert cached_client.get(f"/clients/{client_id}").json()["phone"] == "000"
+
+
+def test_a_load_that_races_a_write_is_not_cached():
+    async def scenario():
+        cache = ClientCache(InMemoryCacheBackend(10), ttl=30)
+        loading = asyncio.Event()
+        release = asyncio.Event()
+
+        async def slow_load():
+            loading.set()
+            await release.wait()
+            return {"id": 1, "status": "active"}
+
+        load = asyncio.create_task(cache.get_or_load(1, slow_load))
+        await loading.wait()
+        await cache.invalidate(1)
+        release.set()
+        return await load, await cache.get(1)
+
+    loaded, cached = asyncio.run(scenario())
+
+    assert loaded == {"id": 1, "status": "active"}
+    assert cached is None
+
+
+def test_concurrent_misses_share_one_load():
+    async def scenario():
+        cache = ClientCache(InMemoryCacheBackend(10), ttl=30)
+        loads = 0
+
+        async def load():
+            nonlocal loads
+            loads += 1
+            await asyncio.sleep(0.01)
+            return {"id": 1}
+
+        results = await asyncio.gather(*(cache.get_or_load(1, load) for _ in range(5)))
+        return loads, results
+
+    loads, results = asyncio.run(scenario())
+
+    assert loads == 1
+    assert results == [{"id": 1}] * 5
+
+
+def test_cache_needs_the_notify_feed_with_several_workers():
+    settings = replace(get_settings(), client_cache_enabled=True)
+
+    with pytest.raises(ValueError):
+        check_client_cache(settings, 2)
+    check_client_cache(settings, 1)
+    check_client_cache(replace(settings, client_changes_notify=True), 2)
@@ -0,0 +1,56 @@
+CLIENT_DATA = {'email': 'lucas@gmail.com', 'username': 'Lucas', 'phone': '987654321', 'status': 'active'}
+
+
+def create_clients(client, count):
+    clients_data = [
+        {**CLIENT_DATA, 'email': f'client{i}@gmail.com', 'username': f'client{i}'} for i in range(count)
+    ]
+    response = client.post("/clients/bulk-create", json=clients_data)
+    assert response.status_code == 200
+
+
+def test_list_clients_returns_all_fields_by_default(client):
+    create_clients(client, 1)
+
+    response = client.get("/clients/list-clients")
+
+    assert response.status_code == 200
+    assert response.json() == {
+        "items": [{"id": 1, "username": "client0", "email": "client0@gmail.com",
+                   "phone": "987654321", "status": "active"}],
+        "next_cursor": None,
+    }
+
+
+def test_list_clients_sparse_fields_keep_cursor(client, assert_queries):
+    create_clients(client, 3)
+
+    response = client.get("/clients/list-clients", params={"fields": "username,status", "limit": 2})
+
+    assert response.status_code == 200
+    assert response.json()["items"] == [
+        {"username": "client0", "status": "active"},
+        {"username": "client1", "status": "active"},
+    ]
+    assert_queries(response, 1)
+
+    next_page = client.get("/clients/list-clients",
+                           params={"fields": "username", "cursor": response.json()["next_cursor"]})
+
+    assert next_page.json() == {"items": [{"username": "client2"}], "next_cursor": None}
+
+
+def test_list_clients_rejects_unknown_fields(client):
+    response = client.get("/clients/list-clients", params={"fields": "username,password"})
+
+    assert response.status_code == 400
+    assert "password" in response.json()["detail"]
+
+
+def test_export_clients_sparse_fields(client):
+    create_clients(client, 2)
+
+    response = client.get("/clients/export", params={"format": "csv", "fields": "id,email"})
+
+    assert response.status_code == 200
+    assert response.text.splitlines() == ["id,email", "1,client0@gmail.com", "2,client1@gmail.com"]
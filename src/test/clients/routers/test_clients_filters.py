@@ -0,0 +1,106 @@
+from dataclasses import replace
+
+from fastapi.testclient import TestClient
+
+from main import create_app
+from src.app.core.config import get_settings
+from src.app.core.jwt_handler import get_current_user
+from src.test.conftest import override_get_current_user
+
+CLIENTS = [
+    {'email': 'ana@gmail.com', 'username': 'Ana', 'phone': '111', 'status': 'active'},
+    {'email': 'bruno@empresa.com', 'username': 'bruno_s', 'phone': '222', 'status': 'inactive'},
+    {'email': 'carla@gmail.com', 'username': 'Carla', 'phone': '333', 'status': 'active'},
+    {'email': 'brunox@empresa.com', 'username': 'brunoxs', 'phone': '444', 'status': 'suspended'},
+]
+
+
+def create_clients(client):
+    response = client.post("/clients/bulk-create", json=CLIENTS)
+    assert response.status_code == 200
+
+
+def usernames(response):
+    assert response.status_code == 200, response.text
+    return [item["username"] for item in response.json()["items"]]
+
+
+def test_filter_by_status(client, assert_queries):
+    create_clients(client)
+
+    response = client.get("/clients/list-clients", params={"status": "active"})
+
+    assert usernames(response) == ["Ana", "Carla"]
+    assert_queries(response, 1)
+
+
+def test_prefix_search_is_case_insensitive(client):
+    create_clients(client)
+
+    assert usernames(client.get("/clients/list-clients", params={"search": "BRU"})) == ["bruno_s", "brunoxs"]
+    assert usernames(client.get("/clients/list-clients", params={"search": "carla@"})) == ["Carla"]
+
+
+def test_search_escapes_like_wildcards(client):
+    create_clients(client)
+
+    response = client.get("/clients/list-clients", params={"search": "bruno_"})
+
+    assert usernames(response) == ["bruno_s"]
+
+
+def test_contains_search(client):
+    create_clients(client)
+
+    response = client.get("/clients/list-clients", params={"search": "empresa", "match": "contains"})
+
+    assert usernames(response) == ["bruno_s", "brunoxs"]
+
+
+def test_contains_search_needs_three_characters(client):
+    response = client.get("/clients/list-clients", params={"search": "an", "match": "contains"})
+
+    assert response.status_code == 400
+
+
+def test_filtered_empty_page(client):
+    create_clients(client)
+
+    response = client.get("/clients/list-clients", params={"search": "zz"})
+
+    assert response.json() == {"items": [], "next_cursor": None}
+
+
+def test_sort_with_cursor(client):
+    create_clients(client)
+
+    params = {"sort": "-email", "limit": 2, "fields": "id"}
+    first_page = client.get("/clients/list-clients", params=params)
+    second_page = client.get("/clients/list-clients",
+                             params={**params, "cursor": first_page.json()["next_cursor"]})
+
+    assert [item["id"] for item in first_page.json()["items"]] == [3, 4]
+    assert [item["id"] for item in second_page.json()["items"]] == [2, 1]
+    assert second_page.json()["next_cursor"] is None
+
+
+def test_cursor_must_match_sort(client):
+    create_clients(client)
+
+    first_page = client.get("/clients/list-clients", params={"sort": "email", "limit": 1})
+    response = client.get("/clients/list-clients",
+                          params={"sort": "username", "cursor": first_page.json()["next_cursor"]})
+
+    assert response.status_code == 400
+
+
+def test_page_sizes_come_from_the_app_settings():
+    app = create_app(replace(get_settings(), default_page_size=1, max_page_size=2))
+    app.dependency_overrides[get_current_user] = override_get_current_user
+
+    with TestClient(app) as client:
+        create_clients(client)
+
+        assert len(usernames(client.get("/clients/list-clients"))) == 1
+        assert len(usernames(client.get("/clients/list-clients", params={"limit": 2}))) == 2
+        assert client.get("/clients/list-clients", params={"limit": 3}).status_code == 422
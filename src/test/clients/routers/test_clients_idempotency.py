@@ -0,0 +1,90 @@
+import asyncio
+import uuid
+from dataclasses import replace
+
+import httpx
+from fastapi.testclient import TestClient
+
+from main import create_app
+from src.app.core.config import get_settings
+from src.app.core.idempotency import DatabaseIdempotencyStore, IdempotencyRecord
+from src.app.core.jwt_handler import create_access_token, get_current_user
+from src.test.conftest import override_get_current_user
+
+CLIENT_DATA = {'email': 'lucas@gmail.com', 'username': 'Lucas', 'phone': '987654321', 'status': 'active'}
+
+
+def headers(key=None):
+    token = create_access_token({"sub": "root", "role": "super_admin"})
+    return {"Authorization": f"Bearer {token}", "Idempotency-Key": key or str(uuid.uuid4())}
+
+
+def test_retry_replays_the_first_response(client):
+    request_headers = headers()
+    first = client.post("/clients/create-client", json=CLIENT_DATA, headers=request_headers)
+    retry = client.post("/clients/create-client", json=CLIENT_DATA, headers=request_headers)
+
+    assert first.status_code == retry.status_code == 201
+    assert retry.json() == first.json()
+    assert retry.headers["idempotent-replayed"] == "true"
+    assert retry.headers["x-db-queries"] == "0"
+    assert client.get("/clients/stats").json()["total"] == 1
+
+
+def test_key_reused_with_different_body_is_rejected(client):
+    request_headers = headers()
+    client.post("/clients/create-client", json=CLIENT_DATA, headers=request_headers)
+
+    response = client.post("/clients/create-client", json={**CLIENT_DATA, 'username': 'other'},
+                           headers=request_headers)
+
+    assert response.status_code == 422
+
+
+def test_concurrent_duplicates_wait_for_the_first_request(client):
+    request_headers = headers()
+
+    async def send_twice():
+        transport = httpx.ASGITransport(app=client.app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://testserver") as http:
+            return await asyncio.gather(*[
+                http.post("/clients/create-client", json=CLIENT_DATA, headers=request_headers) for _ in range(2)
+            ])
+
+    responses = client.portal.call(send_twice)
+
+    assert [response.status_code for response in responses] == [201, 201]
+    assert responses[0].json() == responses[1].json()
+    assert sum("idempotent-replayed" in response.headers for response in responses) == 1
+    assert client.get("/clients/stats").json()["total"] == 1
+
+
+def test_database_store_keeps_records_between_reservations(client):
+    store = DatabaseIdempotencyStore(ttl=60, lock_timeout=60)
+
+    async def exercise():
+        assert await store.reserve("key", "fingerprint") is None
+        in_flight = await store.reserve("key", "fingerprint")
+        await store.complete("key", IdempotencyRecord("fingerprint", 201, [(b"content-type", b"text/plain")], b"ok"))
+        completed = await store.reserve("key", "fingerprint")
+        await store.release("key")
+        return in_flight, completed, await store.reserve("key", "fingerprint")
+
+    in_flight, completed, reserved_again = client.portal.call(exercise)
+
+    assert in_flight.status is None
+    assert (completed.status, completed.headers, completed.body) == (201, [(b"content-type", b"text/plain")], b"ok")
+    assert reserved_again is None
+
+
+def test_app_settings_can_disable_idempotency():
+    app = create_app(replace(get_settings(), idempotency_backend="none"))
+    app.dependency_overrides[get_current_user] = override_get_current_user
+    request_headers = headers()
+
+    with TestClient(app) as client:
+        client.post("/clients/create-client", json=CLIENT_DATA, headers=request_headers)
+        retry = client.post("/clients/create-client", json=CLIENT_DATA, headers=request_headers)
+
+    assert retry.status_code == 400
+    assert "idempotent-replayed" not in retry.headers
@@ -0,0 +1,114 @@
+import csv
+import io
+import os
+import time
+from dataclasses import replace
+
+from fastapi.testclient import TestClient
+
+from main import create_app
+from src.app.core.config import get_settings
+from src.app.core.jwt_handler import get_current_user
+from src.test.conftest import override_get_current_user
+
+CSV_HEADERS = {"Content-Type": "text/csv"}
+
+
+def wait_for(client, job_id):
+    for _ in range(100):
+        job = client.get(f"/clients/import/{job_id}").json()
+        if job["status"] in ("completed", "failed"):
+            return job
+        time.sleep(0.05)
+    raise AssertionError(f"Import job {job_id} did not finish.")
+
+
+def test_import_creates_valid_rows_and_keeps_rejected_ones(client, override_settings, assert_queries):
+    override_settings(client_import_chunk_size=2)
+    body = "\n".join([
+        "username,email,phone,status",
+        "ana,ana@example.com,1,active",
+        "bia,bia@example.com,2,paused",
+        "caio,caio@example.com,3,inactive",
+        "ana,other@example.com,4,active",
+        "duda,duda@example.com,5,suspended",
+    ])
+
+    response = client.post("/clients/import", content=body, headers=CSV_HEADERS)
+    assert response.status_code == 202
+    assert_queries(response)
+    job = wait_for(client, response.json()["id"])
+    assert_queries(client.get(f"/clients/import/{job['id']}"), 1)
+
+    assert (job["status"], job["processed"], job["created"], job["rejected"]) == ("completed", 5, 3, 2)
+    assert client.get("/clients/stats").json()["total"] == 3
+
+    rejected = list(csv.DictReader(io.StringIO(client.get(f"/clients/import/{job['id']}/rejected").text)))
+    assert [(row["line"], row["username"]) for row in rejected] == [("3", "bia"), ("5", "ana")]
+    assert rejected[0]["error"].startswith("status:")
+    assert rejected[1]["error"] == "Username already taken."
+
+
+def test_rows_the_database_refuses_do_not_reject_their_chunk(client, override_settings, refuse_username):
+    override_settings(client_import_chunk_size=4)
+    refuse_username("eve")
+    body = "\n".join([
+        "username,email,phone,status",
+        "ana,ana@example.com,1,active",
+        "eve,eve@example.com,2,active",
+        f"{'x' * 21},long@example.com,3,active",
+        "caio,caio@example.com,4,inactive",
+        "duda,duda@example.com,5,suspended",
+    ])
+
+    response = client.post("/clients/import", content=body, headers=CSV_HEADERS)
+    job = wait_for(client, response.json()["id"])
+
+    assert (job["status"], job["processed"], job["created"], job["rejected"]) == ("completed", 5, 3, 2)
+    rejected = list(csv.DictReader(io.StringIO(client.get(f"/clients/import/{job['id']}/rejected").text)))
+    assert [(row["line"], row["username"]) for row in rejected] == [("4", "x" * 21), ("3", "eve")]
+    assert rejected[0]["error"].startswith("username:")
+    assert rejected[1]["error"] == "Username already taken."
+
+
+def test_import_rejects_files_without_the_client_columns(client):
+    response = client.post("/clients/import", content="username,email\nana,ana@example.com\n", headers=CSV_HEADERS)
+
+    assert response.status_code == 400
+    assert response.json()["detail"] == "CSV is missing columns: phone, status."
+
+
+def test_unknown_import_job(client):
+    assert client.get("/clients/import/unknown").status_code == 404
+
+
+def test_another_worker_reports_the_job_and_serves_its_rejected_rows(client, override_settings, tmp_path):
+    override_settings(client_import_dir=str(tmp_path))
+    body = "username,email,phone,status\nana,ana@example.com,1,active\nbia,bia@example.com,2,paused\n"
+    job_id = client.post("/clients/import", content=body, headers=CSV_HEADERS).json()["id"]
+    wait_for(client, job_id)
+
+    other_worker = create_app(replace(get_settings(), schema_bootstrap="none"))
+    other_worker.dependency_overrides[get_current_user] = override_get_current_user
+    with TestClient(other_worker) as other_client:
+        job = other_client.get(f"/clients/import/{job_id}").json()
+        rejected = other_client.get(f"/clients/import/{job_id}/rejected").text
+
+    assert (job["status"], job["created"], job["rejected"]) == ("completed", 1, 1)
+    assert [row["username"] for row in csv.DictReader(io.StringIO(rejected))] == ["bia"]
+    assert os.listdir(tmp_path) == [f"{job_id}.csv.rejected.csv"]
+
+
+def test_old_jobs_are_discarded_with_their_files(client, override_settings, tmp_path):
+    override_settings(client_import_dir=str(tmp_path), client_import_max_jobs=1)
+    body = "username,email,phone,status\nana,ana@example.com,1,paused\n"
+    first = client.post("/clients/import", content=body, headers=CSV_HEADERS).json()["id"]
+    wait_for(client, first)
+    second = client.post("/clients/import", content=body, headers=CSV_HEADERS).json()["id"]
+    wait_for(client, second)
+    third = client.post("/clients/import", content=body, headers=CSV_HEADERS).json()["id"]
+    wait_for(client, third)
+
+    assert client.get(f"/clients/import/{first}").status_code == 404
+    assert client.get(f"/clients/import/{second}").status_code == 200
+    assert sorted(os.listdir(tmp_path)) == sorted(f"{job_id}.csv.rejected.csv" for job_id in (second, third))
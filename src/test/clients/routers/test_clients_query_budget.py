@@ -0,0 +1,68 @@
+CLIENT_DATA = {'email': 'lucas@gmail.com', 'username': 'Lucas', 'phone': '987654321', 'status': 'active'}
+
+
+def create_client(client, **overrides):
+    response = client.post("/clients/create-client", json={**CLIENT_DATA, **overrides})
+    assert response.status_code == 201
+    return response
+
+
+def test_create_client_queries(client, assert_queries):
+    assert_queries(create_client(client), 3)
+
+
+def test_bulk_create_clients_queries(client, assert_queries):
+    clients_data = [
+        {**CLIENT_DATA, 'email': f'client{i}@gmail.com', 'username': f'client{i}'} for i in range(3)
+    ]
+    response = client.post("/clients/bulk-create", json=clients_data)
+
+    assert response.status_code == 200
+    assert response.json()["created"] == 3
+    assert_queries(response, 3)
+
+
+def test_list_clients_queries(client, assert_queries):
+    create_client(client)
+    create_client(client, email='maria@gmail.com', username='Maria')
+
+    response = client.get("/clients/list-clients")
+
+    assert response.status_code == 200
+    assert_queries(response, 1)
+
+
+def test_get_client_by_id_queries(client, assert_queries):
+    client_id = create_client(client).json()['id']
+
+    response = client.get(f"/clients/{client_id}")
+
+    assert response.status_code == 200
+    assert_queries(response, 1)
+
+
+def test_update_client_queries(client, assert_queries):
+    client_id = create_client(client).json()['id']
+
+    response = client.put(f"/clients/{client_id}", json={**CLIENT_DATA, 'status': 'inactive'})
+
+    assert response.status_code == 200
+    assert_queries(response, 3)
+
+
+def test_update_client_without_status_change_queries(client, assert_queries):
+    client_id = create_client(client).json()['id']
+
+    response = client.put(f"/clients/{client_id}", json={**CLIENT_DATA, 'phone': '123'})
+
+    assert response.status_code == 200
+    assert_queries(response, 2)
+
+
+def test_delete_client_queries(client, assert_queries):
+    client_id = create_client(client).json()['id']
+
+    response = client.delete(f"/clients/{client_id}")
+
+    assert response.status_code == 204
+    assert_queries(response, 2)
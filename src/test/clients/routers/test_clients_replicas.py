@@ -0,0 +1,66 @@
+import os
+import tempfile
+from dataclasses import replace
+
+import pytest
+from fastapi.testclient import TestClient
+
+from main import create_app
+from src.app.core.config import get_settings
+from src.app.core.jwt_handler import get_current_user
+from src.test.conftest import override_get_current_user
+
+CLIENT_DATA = {'email': 'lucas@gmail.com', 'username': 'Lucas', 'phone': '987654321', 'status': 'active'}
+
+
+def build_client(**settings):
+    app = create_app(replace(get_settings(), **settings))
+    app.dependency_overrides[get_current_user] = override_get_current_user
+    return TestClient(app)
+
+
+@pytest.fixture
+def replica_url():
+    url = f"sqlite+aiosqlite:///{os.path.join(tempfile.mkdtemp(), 'replica.db')}"
+    with build_client(database_url=url) as replica:
+        replica.post("/clients/create-client", json={**CLIENT_DATA, 'status': 'suspended'})
+    return url
+
+
+def total(client, **kwargs):
+    response = client.get("/clients/stats", **kwargs)
+    assert response.status_code == 200
+    return response.json()
+
+
+def test_reads_go_to_replica_until_a_write(replica_url):
+    with build_client(database_replica_urls=(replica_url,)) as client:
+        assert total(client)["suspended"] == 1
+
+        response = client.post("/clients/create-client", json=CLIENT_DATA)
+        assert "read_primary" in response.headers["set-cookie"]
+
+        assert total(client) == {"active": 1, "inactive": 0, "suspended": 0, "total": 1}
+        client.cookies.clear()
+        assert total(client)["suspended"] == 1
+        assert total(client, headers={"X-Read-Primary": "1"})["active"] == 1
+
+
+def test_unreachable_replica_falls_back_to_primary():
+    missing = f"sqlite+aiosqlite:///{os.path.join(tempfile.mkdtemp(), 'missing', 'replica.db')}"
+    with build_client(database_replica_urls=(missing,)) as client:
+        client.post("/clients/create-client", json=CLIENT_DATA)
+        client.cookies.clear()
+
+        assert total(client)["active"] == 1
+        assert client.get("/clients/1").json()["username"] == "Lucas"
+
+
+def test_replica_reads_do_not_fill_the_client_cache(replica_url):
+    with build_client(database_replica_urls=(replica_url,), client_cache_enabled=True) as client:
+        client.post("/clients/create-client", json=CLIENT_DATA)
+        client.cookies.clear()
+
+        assert client.get("/clients/1").json()["status"] == "suspended"
+        assert client.get("/clients/1", headers={"X-Read-Primary": "1"}).json()["status"] == "active"
+        assert client.get("/clients/1").json()["status"] == "active"
@@ -0,0 +1,80 @@
+from sqlalchemy import delete, func, select
+
+from src.app.core.config import get_settings
+from src.app.db.database import SessionLocal
+from src.app.models.client import Status
+from src.app.models.client_status_count import ClientStatusCount
+from src.app.services.client import ClientService, adjust_status_counts
+
+CLIENT_DATA = {'email': 'lucas@gmail.com', 'username': 'Lucas', 'phone': '987654321', 'status': 'active'}
+
+
+def create_clients(client, statuses):
+    clients_data = [
+        {**CLIENT_DATA, 'email': f'client{i}@gmail.com', 'username': f'client{i}', 'status': client_status}
+        for i, client_status in enumerate(statuses)
+    ]
+    response = client.post("/clients/bulk-create", json=clients_data)
+    assert response.status_code == 200
+
+
+def stats(client):
+    response = client.get("/clients/stats")
+    assert response.status_code == 200
+    return response.json()
+
+
+def test_stats_follow_writes(client, assert_queries):
+    create_clients(client, ["active", "active", "inactive"])
+    client.post("/clients/create-client",
+                json={**CLIENT_DATA, 'email': 'new@gmail.com', 'username': 'new', 'status': 'suspended'})
+    client.put("/clients/1", json={**CLIENT_DATA, 'status': 'inactive'})
+    client.delete("/clients/2")
+    client.post("/clients/bulk-status", json={"status": "suspended", "ids": [1, 3]})
+
+    response = client.get("/clients/stats")
+
+    assert response.json() == {"active": 0, "inactive": 0, "suspended": 3, "total": 3}
+    assert_queries(response, 1)
+
+
+def test_reconcile_recomputes_counts(client):
+    create_clients(client, ["active", "inactive", "inactive"])
+
+    async def drift_and_reconcile():
+        async with SessionLocal() as db:
+            await adjust_status_counts(db, {Status.ACTIVE: 5, Status.SUSPENDED: -2})
+            await db.commit()
+            return await ClientService.reconcile_status_counts(db)
+
+    assert client.portal.call(drift_and_reconcile) == {"active": 1, "inactive": 2, "suspended": 0, "total": 3}
+    assert stats(client) == {"active": 1, "inactive": 2, "suspended": 0, "total": 3}
+
+
+def test_reconcile_restores_missing_shards(client):
+    create_clients(client, ["active", "suspended"])
+
+    async def drop_shards_and_reconcile():
+        async with SessionLocal() as db:
+            await db.execute(delete(ClientStatusCount).where(ClientStatusCount.shard > 0))
+            await db.commit()
+            counts = await ClientService.reconcile_status_counts(db)
+            return counts, await db.scalar(select(func.count()).select_from(ClientStatusCount))
+
+    counts, rows = client.portal.call(drop_shards_and_reconcile)
+
+    assert counts == {"active": 1, "inactive": 0, "suspended": 1, "total": 2}
+    assert rows == len(Status) * get_settings().client_status_count_shards
+
+
+def test_writes_create_missing_shards(client):
+    async def drop_shards():
+        async with SessionLocal() as db:
+            await db.execute(delete(ClientStatusCount))
+            await db.commit()
+
+    client.portal.call(drop_shards)
+    create_clients(client, ["active", "active", "inactive"])
+    client.post("/clients/bulk-status", json={"status": "suspended", "ids": [1]})
+
+    assert stats(client) == {"active": 1, "inactive": 1, "suspended": 1, "total": 3}
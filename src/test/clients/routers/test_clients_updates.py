@@ -0,0 +1,41 @@
+CLIENT_DATA = {'email': 'lucas@gmail.com', 'username': 'Lucas', 'phone': '987654321', 'status': 'active'}
+OTHER_DATA = {'email': 'maria@gmail.com', 'username': 'Maria', 'phone': '123456789', 'status': 'active'}
+
+
+def create_two_clients(client):
+    first = client.post("/clients/create-client", json=CLIENT_DATA).json()["id"]
+    client.post("/clients/create-client", json=OTHER_DATA)
+    return first
+
+
+def test_update_with_a_taken_email(client):
+    client_id = create_two_clients(client)
+
+    response = client.put(f"/clients/{client_id}", json={**CLIENT_DATA, 'email': OTHER_DATA['email']})
+
+    assert response.status_code == 400
+    assert response.json()["detail"] == "Email already registered."
+
+
+def test_update_with_a_taken_username(client):
+    client_id = create_two_clients(client)
+
+    response = client.put(f"/clients/{client_id}", json={**CLIENT_DATA, 'username': OTHER_DATA['username']})
+
+    assert response.status_code == 400
+    assert response.json()["detail"] == "Username already taken."
+
+
+def test_update_reports_every_conflict(client):
+    client_id = create_two_clients(client)
+
+    response = client.put(f"/clients/{client_id}", json={**OTHER_DATA, 'phone': '000'})
+
+    assert response.status_code == 400
+    assert response.json()["detail"] == "Email already registered.; Username already taken."
+    assert client.get(f"/clients/{client_id}").json()["email"] == CLIENT_DATA["email"]
+
+
+def test_update_and_delete_of_a_missing_client(client):
+    assert client.put("/clients/999", json=CLIENT_DATA).status_code == 404
+    assert client.delete("/clients/999").status_code == 404
@@ -0,0 +1,81 @@
+import os
+import tempfile
+from dataclasses import replace
+from typing import Optional
+
+import pytest
+
+os.environ.setdefault(
+    "SQLALCHEMY_DATABASE_URL", f"sqlite+aiosqlite:///{os.path.join(tempfile.mkdtemp(), 'test.db')}"
+)
+os.environ.update({
+    "ENVIRONMENT_TYPE": "test",
+    "SCHEMA_BOOTSTRAP": "reset",
+    "SECRET_KEY": "test-secret-key",
+    "DB_DEBUG_HEADERS": "true",
+    "HASHING_POOL_SIZE": "1",
+    "SUPER_ADMIN_EMAIL": "root@example.com",
+    "SUPER_ADMIN_USERNAME": "root",
+    "SUPER_ADMIN_PASSWORD": "root-password",
+})
+
+from fastapi.testclient import TestClient  # noqa: E402
+
+from sqlalchemy import text  # noqa: E402
+
+from main import app  # noqa: E402
+from src.app.core import config  # noqa: E402
+from src.app.db.database import SessionLocal  # noqa: E402
+from src.app.core.jwt_handler import get_current_user  # noqa: E402
+
+
+async def override_get_current_user():
+    return {"sub": "root", "role": "super_admin"}
+
+
+@pytest.fixture
+def client():
+    app.dependency_overrides[get_current_user] = override_get_current_user
+    with TestClient(app) as test_client:
+        yield test_client
+    app.dependency_overrides.clear()
+
+
+@pytest.fixture
+def override_settings(monkeypatch):
+    def override(**changes):
+        monkeypatch.setattr(config, "_active_settings", replace(config.get_settings(), **changes))
+
+    return override
+
+
+@pytest.fixture
+def refuse_username(client):
+    # Stands in for a row committed by another request between the duplicate check and the INSERT.
+    def refuse(username: str):
+        async def create_trigger():
+            async with SessionLocal() as db:
+                await db.execute(text(
+                    f"CREATE TRIGGER refuse_{username} BEFORE INSERT ON clients WHEN NEW.username = '{username}' "
+                    "BEGIN SELECT RAISE(ABORT, 'UNIQUE constraint failed: clients.username'); END"
+                ))
+                await db.commit()
+
+        client.portal.call(create_trigger)
+
+    return refuse
+
+
+@pytest.fixture
+def assert_queries():
+    def check(response, expected: Optional[int] = None):
+        request = f"{response.request.method} {response.request.url.path}"
+        queries = int(response.headers["x-db-queries"])
+        budget = response.headers.get("x-db-query-budget")
+
+        assert budget is not None, f"{request} has no query budget."
+        assert queries <= int(budget), f"{request} ran {queries} SQL statements (budget: {budget})."
+        if expected is not None:
+            assert queries == expected, f"{request} ran {queries} SQL statements, expected {expected}."
+
+    return check
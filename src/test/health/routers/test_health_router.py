@@ -0,0 +1,25 @@
+from fastapi.testclient import TestClient
+
+from main import app
+
+
+def test_live(client):
+    response = client.get("/health/live")
+
+    assert response.status_code == 200
+    assert response.json() == {"status": "ok"}
+
+
+def test_ready_queries(client, assert_queries):
+    response = client.get("/health/ready")
+
+    assert response.status_code == 200
+    assert response.json() == {"status": "ready"}
+    assert_queries(response, 1)
+
+
+def test_not_ready_before_startup():
+    response = TestClient(app).get("/health/ready")
+
+    assert response.status_code == 503
+    assert response.headers["retry-after"] == "1"
@@ -0,0 +1,33 @@
+import asyncio
+import os
+import signal
+
+import httpx
+
+from src.app.core import hashing
+
+CREDENTIALS = {"username": "root", "password": "root-password"}
+
+
+def test_login_recovers_when_a_hashing_process_dies(client):
+    assert client.post("/security/token", data=CREDENTIALS).status_code == 200
+
+    for pid in list(hashing.get_hashing_executor()._processes):
+        os.kill(pid, signal.SIGKILL)
+
+    assert client.post("/security/token", data=CREDENTIALS).status_code == 200
+    assert client.post("/security/token", data=CREDENTIALS).status_code == 200
+
+
+def test_saturated_hashing_pool_answers_503(client, override_settings):
+    override_settings(hashing_pool_size=1, hashing_queue_limit=0)
+
+    async def login_twice():
+        transport = httpx.ASGITransport(app=client.app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://testserver") as http:
+            return await asyncio.gather(*[http.post("/security/token", data=CREDENTIALS) for _ in range(2)])
+
+    responses = client.portal.call(login_twice)
+
+    assert sorted(response.status_code for response in responses) == [200, 503]
+    assert client.post("/security/token", data=CREDENTIALS).status_code == 200
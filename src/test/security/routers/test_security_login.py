@@ -0,0 +1,20 @@
+ADMIN_DATA = {'email': 'admin@gmail.com', 'username': 'admin', 'password': 'admin-password'}
+SUPER_ADMIN_LOGIN = {'username': 'root', 'password': 'root-password'}
+
+
+def test_admin_cannot_take_the_super_admin_username(client):
+    response = client.post("/security/create-admin", json={**ADMIN_DATA, 'username': 'root'})
+
+    assert response.status_code == 400
+    assert response.json()["detail"] == "Username already taken."
+    assert client.post("/security/token", data=SUPER_ADMIN_LOGIN).status_code == 200
+
+
+def test_admin_cannot_be_renamed_to_the_super_admin_username(client):
+    admin_id = client.post("/security/create-admin", json=ADMIN_DATA).json()['id']
+
+    response = client.put(f"/admins/{admin_id}", json={'email': 'admin@gmail.com', 'username': 'root'})
+
+    assert response.status_code == 400
+    assert client.get(f"/admins/{admin_id}").json()['username'] == 'admin'
+    assert client.put("/admins/999", json={'email': 'x@gmail.com', 'username': 'root'}).status_code == 404
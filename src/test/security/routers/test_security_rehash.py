@@ -0,0 +1,50 @@
+from passlib.hash import bcrypt
+from sqlalchemy import insert, select
+
+from src.app.core.config import get_settings
+from src.app.db.database import SessionLocal
+from src.app.models.admin import Admin
+
+
+def stored_hash(client, username):
+    async def load():
+        async with SessionLocal() as db:
+            return await db.scalar(select(Admin.password).where(Admin.username == username))
+
+    return client.portal.call(load)
+
+
+def create_legacy_admin(client):
+    async def create():
+        async with SessionLocal() as db:
+            await db.execute(insert(Admin).values(username="legacy", email="legacy@example.com",
+                                                  password=bcrypt.using(rounds=4).hash("legacy-password")))
+            await db.commit()
+
+    client.portal.call(create)
+
+
+def test_login_rehashes_passwords_with_outdated_rounds(client):
+    create_legacy_admin(client)
+    credentials = {"username": "legacy", "password": "legacy-password"}
+
+    first = client.post("/security/token", data=credentials)
+    assert first.status_code == 200
+    assert first.headers["x-db-queries"] == "2"
+    rehashed = stored_hash(client, "legacy")
+    assert bcrypt.from_string(rehashed).rounds == get_settings().bcrypt_rounds
+
+    second = client.post("/security/token", data=credentials)
+    assert second.status_code == 200
+    assert second.headers["x-db-queries"] == "1"
+    assert stored_hash(client, "legacy") == rehashed
+
+
+def test_wrong_password_does_not_rehash(client):
+    create_legacy_admin(client)
+    original = stored_hash(client, "legacy")
+
+    response = client.post("/security/token", data={"username": "legacy", "password": "wrong"})
+
+    assert response.status_code == 401
+    assert stored_hash(client, "legacy") == original